@@ -0,0 +1,195 @@
+"""
+    batch_compare
+    =============
+
+    Compare projects with their environments without the GUI.
+
+        python -m projects.main compare --all [--json] [--mode deep]
+        python -m projects.main compare projects psiutils
+
+    Every project × environment pair is compared on a thread pool, using
+    the environments cached in the projects file (--refresh scans them
+    again first). The result is printed as a table, or as JSON with the
+    missing and mismatched files of each pair. A shallow compare also
+    lists the files it could not decide without reading them; these may
+    differ, but are not counted as differences.
+
+    The exit code is EXIT_OK if every pair matches, EXIT_DIFFERENT if any
+    differ and EXIT_ERROR if no projects were loaded or a pair could not
+    be compared.
+"""
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from projects import logger
+from projects.compare import DEEP, RECORD, SHALLOW, compare
+from projects.config import config
+from projects.constants import VERSION_FILE
+from projects.project_server import get_project_server
+
+EXIT_OK = 0
+EXIT_DIFFERENT = 1
+EXIT_ERROR = 2
+
+MODES = (RECORD, DEEP, SHALLOW)
+
+
+class PairResult(NamedTuple):
+    project: str
+    env: str
+    version: str
+    dir: str
+    only_in_env: list[str]
+    only_in_project: list[str]
+    mismatches: list[str]
+    may_differ: list[str]
+    error: str
+
+    @property
+    def status(self) -> str:
+        if self.error:
+            return 'error'
+        if self.only_in_env or self.only_in_project or self.mismatches:
+            return 'different'
+        return 'ok'
+
+
+def main(argv: list[str] = None) -> int:
+    """Run the batch compare and return the exit code."""
+    args = _parser().parse_args(argv)
+    server = get_project_server()
+    if not server.projects:
+        # A missing or unreadable projects file is not "no drift"
+        print(f'No projects loaded from {server.project_file}',
+              file=sys.stderr)
+        return EXIT_ERROR
+
+    if args.refresh:
+        server.refresh_versions()
+        server.save_projects()
+
+    names = sorted(server.projects) if args.all else args.projects
+    unknown = [name for name in names if name not in server.projects]
+    if unknown:
+        print(f'Unknown project: {", ".join(unknown)}', file=sys.stderr)
+        return EXIT_ERROR
+
+    pairs = [
+        (server.projects[name], version)
+        for name in names
+        for version in server.projects[name].get_versions().values()
+    ]
+    results = compare_pairs(pairs, args.mode, args.workers)
+
+    if args.json:
+        print(json.dumps(
+            [{**result._asdict(), 'status': result.status}
+             for result in results],
+            indent=4))
+    else:
+        print(format_table(results))
+    return exit_code(results)
+
+
+def compare_pairs(
+        pairs: list[tuple],
+        mode: str = RECORD,
+        workers: int = 0) -> list[PairResult]:
+    """Compare each (project, env_version) pair on a thread pool."""
+    # pylint: disable=no-member
+    workers = max(1, workers or config.load_workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            lambda pair: _compare_pair(*pair, mode), pairs))
+
+
+def _compare_pair(project, env_version, mode: str) -> PairResult:
+    undecided = []
+    try:
+        missing, mismatches = compare(
+            project.source_dir, env_version.dir, mode=mode,
+            undecided=undecided)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.warning(
+            "Compare failed",
+            project=project.name,
+            env=env_version.name,
+            error=str(error),
+        )
+        return PairResult(
+            project.name, env_version.name, env_version.version,
+            env_version.dir, [], [], [], [], str(error))
+
+    return PairResult(
+        project.name,
+        env_version.name,
+        env_version.version,
+        env_version.dir,
+        [item[0] for item in missing if item[0]],
+        [item[1] for item in missing if item[1]],
+        # As in the versions dialog, the version file is expected to differ
+        [name for name in mismatches if name != VERSION_FILE],
+        [name for name in undecided if name != VERSION_FILE],
+        '',
+    )
+
+
+def format_table(results: list[PairResult]) -> str:
+    """Return the results as a table, one pair per line."""
+    headings = ('Project', 'Environment', 'Version', 'Status',
+                'Missing', 'May differ', 'Mismatched')
+    rows = [
+        (result.project,
+         result.env,
+         result.version,
+         result.status,
+         str(len(result.only_in_env) + len(result.only_in_project)),
+         str(len(result.may_differ)),
+         result.error or ' '.join(result.mismatches))
+        for result in results
+    ]
+    widths = [
+        max([len(heading)] + [len(row[index]) for row in rows])
+        for index, heading in enumerate(headings[:-1])
+    ]
+    lines = []
+    for row in [headings] + rows:
+        cells = [cell.ljust(width) for cell, width in zip(row, widths)]
+        lines.append('  '.join(cells + [row[-1]]).rstrip())
+    return '\n'.join(lines)
+
+
+def exit_code(results: list[PairResult]) -> int:
+    """Return the exit code for the results."""
+    statuses = {result.status for result in results}
+    if 'error' in statuses:
+        return EXIT_ERROR
+    if 'different' in statuses:
+        return EXIT_DIFFERENT
+    return EXIT_OK
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='projects compare',
+        description='Compare projects with their environments.')
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument(
+        '--all', action='store_true', help='compare every project')
+    selection.add_argument(
+        'projects', nargs='*', default=[], help='the projects to compare')
+    parser.add_argument(
+        '--json', action='store_true', help='print the results as JSON')
+    parser.add_argument(
+        '--mode', choices=MODES, default=RECORD,
+        help='how files are compared (default: %(default)s)')
+    parser.add_argument(
+        '--refresh', action='store_true',
+        help='scan the environments before comparing')
+    parser.add_argument(
+        '--workers', type=int, default=0,
+        help='number of compares run at once')
+    return parser
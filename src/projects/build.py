@@ -3,37 +3,47 @@ from contextlib import chdir
 import os
 import subprocess
 import shutil
+from functools import cache
 from pathlib import Path
-from dotenv import load_dotenv
 
 from psiutils.constants import Status
 from projects import logger
 
 from projects.project import Project
 from projects.modules import check_imports
+from projects.tasks import Task
 
-try:
-    load_dotenv()
-    os.environ["UV_PUBLISH_TOKEN"] = os.getenv("UV_PUBLISH_TOKEN")
-    UV_PUBLISH_TOKEN = True
-except TypeError:
-    logger.error("No .env file found in root dir, or invalid content.")
-    UV_PUBLISH_TOKEN = False
+
+@cache
+def publish_token_available() -> bool:
+    """Load the .env file on first use; return True if it sets the token."""
+    from dotenv import load_dotenv
+    try:
+        load_dotenv()
+        os.environ["UV_PUBLISH_TOKEN"] = os.getenv("UV_PUBLISH_TOKEN")
+    except TypeError:
+        logger.error("No .env file found in root dir, or invalid content.")
+        return False
+    return True
 
 
-def update_module(context: dict) -> int:
+def update_module(context: dict, task: Task = None) -> int:
+    """Build, upload and push the project; task receives progress."""
 
     project = context['project']
     logger.info(
         "Starting build process",
         project=project.name,
     )
+    _report(task, 'Checking imports')
     check_imports(project.name, project.source_dir)
 
     if not context['test_build']:
+        _report(task, 'Updating version')
         if _update_version(project, context['version']) != Status.OK:
             return Status.ERROR
 
+        _report(task, 'Updating history')
         if project.update_history(context['history']) != Status.OK:
             return Status.ERROR
         logger.info(
@@ -45,20 +55,30 @@ def update_module(context: dict) -> int:
                 and _delete_build_dirs(project) != Status.OK):
             return Status.ERROR
 
+    _report(task, 'Building')
     if _build(project) != Status.OK:
         _restore_project(context)
         return Status.ERROR
 
+    _report(task, 'Uploading')
     if _upload(project, context['test_build']) != Status.OK:
         _restore_project(context)
         return Status.ERROR
+    # The backup must not be committed with the release
+    project.discard_history_backup()
 
+    _report(task, 'Pushing to git')
     if _git_push(context) != Status.OK:
         return Status.ERROR
 
     return Status.OK
 
 
+def _report(task: Task | None, step: str) -> None:
+    if task:
+        task.report(step)
+
+
 def _update_version(project: Project, version: str) -> int:
     if project.update_version(version) != Status.OK:
         return Status.ERROR
@@ -86,7 +106,9 @@ def _restore_project(context: dict) -> None:
         project=project.name,
     )
     _update_version(project, context['current_version'])
-    project.update_history(context['current_history'])
+    if not context['test_build']:
+        # The history is only updated, and backed up, on a real build
+        project.restore_history()
 
 
 def _build(project: Project) -> int:
@@ -1,11 +1,150 @@
-"""Compare the files in two directories."""
+"""Compare the files in two directories.
+
+The comparison recurses into sub-directories. Each directory has a hash
+combined from the names and content hashes of everything in it, so a
+sub-directory whose hash matches its counterpart is skipped without
+comparing its files one by one. The names in config.ignore are skipped
+at every level. File hashes come from the shared HashCache, so unchanged
+files are not read again.
+
+Missing files and mismatches are reported as paths relative to the
+directories compared, e.g. 'forms/frm_main.py'.
+
+There are two modes. DEEP verifies files by their contents. SHALLOW, like
+filecmp's shallow comparison, never opens a file: files of different
+sizes differ, files with the same size and mtime are taken to be the
+same, and otherwise the hashes in the HashCache decide if both are still
+valid. A file that cannot be decided is put in the undecided list, if the
+caller passes one, and is otherwise reported as a mismatch.
+
+RECORD checks an installed package against the sha256 and size of each
+file in its dist-info RECORD. Only the project's files are hashed, once,
+through the HashCache; the environment's files are only listed and
+stat'ed. A file that RECORD does not list is compared by content. An
+editable install, or one without a RECORD, is compared as DEEP.
+"""
+import hashlib
+import os
 from pathlib import Path
 
 from projects.config import config
+from projects.file_compare import file_hash, same_contents
+from projects.hash_cache import HashCache, get_hash_cache
+from projects.record import RecordEntry, package_record, record_digest
+
+SHALLOW = 'shallow'
+DEEP = 'deep'
+RECORD = 'record'
+
+
+class TreeHasher():
+    """Content hashes of files and directories, computed once per path."""
+
+    def __init__(self, hash_cache: HashCache = None) -> None:
+        self.hash_cache = hash_cache
+        self.file_hashes: dict[Path, str] = {}
+        self.tree_hashes: dict[Path, str] = {}
+
+    def file_hash(self, path: Path) -> str:
+        if path not in self.file_hashes:
+            if self.hash_cache:
+                self.file_hashes[path] = self.hash_cache.file_hash(path)
+            else:
+                self.file_hashes[path] = file_hash(path)
+        return self.file_hashes[path]
+
+    def tree_hash(self, path: Path) -> str:
+        """Return a hash of the names and contents of the directory."""
+        if path in self.tree_hashes:
+            return self.tree_hashes[path]
+
+        digest = hashlib.sha256()
+        for child in sorted(_dir_entries(path)):
+            if child.is_dir():
+                entry = f'{child.name}\0d\0{self.tree_hash(child)}\n'
+            else:
+                entry = f'{child.name}\0f\0{self.file_hash(child)}\n'
+            digest.update(entry.encode('utf-8', 'surrogateescape'))
+        self.tree_hashes[path] = digest.hexdigest()
+        return self.tree_hashes[path]
+
+    def same_file(self, path_0: Path, path_1: Path) -> bool:
+        """Return True if the files have the same contents."""
+        hash_0 = self._known_hash(path_0)
+        hash_1 = self._known_hash(path_1)
+        if hash_0 and hash_1:
+            return hash_0 == hash_1
+        if not self.hash_cache:
+            return same_contents(path_0, path_1)
+        if os.stat(path_0).st_size != os.stat(path_1).st_size:
+            return False
+        # Hashed through the cache, so neither file is read again by a
+        # later compare while it is unchanged
+        return self.file_hash(path_0) == self.file_hash(path_1)
+
+    def same_stat(self, path_0: Path, path_1: Path) -> bool | None:
+        """Return True if the files are the same, judged without reading.
+
+        Return None if that cannot be decided.
+        """
+        stat_0 = os.stat(path_0)
+        stat_1 = os.stat(path_1)
+        if stat_0.st_size != stat_1.st_size:
+            return False
+        if stat_0.st_mtime_ns == stat_1.st_mtime_ns:
+            return True
+        hash_0 = self._known_hash(path_0)
+        hash_1 = self._known_hash(path_1)
+        if hash_0 and hash_1:
+            return hash_0 == hash_1
+        return None
+
+    def _known_hash(self, path: Path) -> str | None:
+        if path in self.file_hashes:
+            return self.file_hashes[path]
+        if self.hash_cache:
+            return self.hash_cache.cached_hash(path)
+        return None
+
+
+def compare(
+        source_dir: str,
+        env_dir: str,
+        hash_cache: HashCache = None,
+        mode: str = DEEP,
+        undecided: list = None) -> list[str]:
+    """Compare the standard and dev versions of the projects.
+
+    In SHALLOW mode the files that cannot be decided are appended to
+    undecided if it is given.
+    """
+    if mode not in (SHALLOW, DEEP, RECORD):
+        raise ValueError(f'Invalid compare mode: {mode}')
+    missing = []
+    mismatches = []
+    hasher = TreeHasher(hash_cache or get_hash_cache())
+    if mode == RECORD:
+        if record := package_record(env_dir):
+            return _compare_record(
+                Path(source_dir), Path(env_dir), record, hasher)
+        mode = DEEP
+    if undecided is None:
+        undecided = mismatches
+    _compare_dirs(
+        Path(source_dir), Path(env_dir), '', hasher, mode,
+        missing, mismatches, undecided)
+    return (missing, mismatches)
 
 
-def compare(source_dir: str, env_dir: str) -> list[str]:
-    """Compare the standard and dev versions of the projects."""
+def _compare_dirs(
+        source_dir: Path,
+        env_dir: Path,
+        prefix: str,
+        hasher: TreeHasher,
+        mode: str,
+        missing: list,
+        mismatches: list,
+        undecided: list) -> None:
     # comparison is a dict keyed on file name
     # each element contains 'project' and 'env' entries if the file exists in
     # the relevant directories
@@ -13,64 +152,97 @@ def compare(source_dir: str, env_dir: str) -> list[str]:
     comparison = _build_comparison(comparison, source_dir, 'project')
     comparison = _build_comparison(comparison, env_dir, 'env')
 
-    missing = _compare_existence(comparison)
-    mismatches = _compare_contents(comparison)
-    return (missing, mismatches)
-
-
-def _compare_existence(comparison: dict) -> list:
-    missing = []
     for name, files in comparison.items():
+        relative_path = f'{prefix}{name}'
         if 'project' not in files:
-            missing.append((name, ''))
+            missing.append((relative_path, ''))
         if 'env' not in files:
-            missing.append(('', name))
-    return missing
+            missing.append(('', relative_path))
+        if 'project' not in files or 'env' not in files:
+            continue
+
+        project_path = files['project']
+        env_path = files['env']
+        if project_path.is_dir() and env_path.is_dir():
+            # Tree hashes read every file, so a shallow compare recurses
+            if (mode == SHALLOW
+                    or hasher.tree_hash(project_path)
+                    != hasher.tree_hash(env_path)):
+                _compare_dirs(
+                    project_path, env_path, f'{relative_path}/', hasher,
+                    mode, missing, mismatches, undecided)
+        elif project_path.is_dir() or env_path.is_dir():
+            mismatches.append(relative_path)
+        elif mode == SHALLOW:
+            same = hasher.same_stat(project_path, env_path)
+            if same is None:
+                undecided.append(relative_path)
+            elif not same:
+                mismatches.append(relative_path)
+        elif not hasher.same_file(project_path, env_path):
+            mismatches.append(relative_path)
 
 
-def _compare_contents(comparison: dict) -> list:
+def _compare_record(
+        source_dir: Path,
+        env_dir: Path,
+        record: dict[str, RecordEntry],
+        hasher: TreeHasher) -> tuple[list, list]:
+    source_files = _tree_files(source_dir)
+    env_files = _tree_files(env_dir)
+    missing = [(name, '') for name in sorted(env_files - source_files)]
+    missing += [('', name) for name in sorted(source_files - env_files)]
+
     mismatches = []
-    for name, files in comparison.items():
-        if 'project' in files and 'env' in files:
-            contents_0 = _file_contents(files['project'])
-            contents_1 = _file_contents(files['env'])
-            if contents_0 != contents_1:
-                mismatches.append(name)
-    return mismatches
+    for name in sorted(source_files & env_files):
+        source_path = Path(source_dir, name)
+        env_path = Path(env_dir, name)
+        if entry := record.get(name):
+            same = (
+                os.stat(env_path).st_size == entry.size
+                and record_digest(hasher.file_hash(source_path))
+                == entry.digest)
+        else:
+            same = hasher.same_file(source_path, env_path)
+        if not same:
+            mismatches.append(name)
+    return (missing, mismatches)
 
 
-def _file_contents(path: str) -> str:
-    if not path.is_file():
-        file_list = list(path.iterdir())
-        return len(file_list)
-    with open(path, 'r', encoding='utf-8') as f_contents:
-        return f_contents.read()
+def _tree_files(root: Path) -> set[str]:
+    # Relative paths of the files below root, without reading them
+    files = set()
+    for directory, subdirs, file_names in os.walk(root):
+        subdirs[:] = [name for name in subdirs if name not in config.ignore]
+        relative = Path(directory).relative_to(root).as_posix()
+        prefix = '' if relative == '.' else f'{relative}/'
+        files.update(
+            f'{prefix}{name}'
+            for name in file_names
+            if name not in config.ignore)
+    return files
+
+
+def _dir_entries(search_dir: Path) -> list[Path]:
+    # pylint: disable=no-member)
+    return [
+        path
+        for path in search_dir.iterdir()
+        if (path.is_file() or path.is_dir())
+        and path.name not in config.ignore
+    ]
 
 
 def _build_comparison(
         comparison: dict, search_path: str, location: str) -> dict:
-    # pylint: disable=no-member)
     search_dir = Path(search_path)
-    file_list = []
     try:
-        file_list.extend(
-            name
-            for name in search_dir.iterdir()
-            if name.is_file() or name.is_dir()
-        )
+        file_list = _dir_entries(search_dir)
     except FileNotFoundError:
         return {str(search_dir): 'xxx'}
 
-    # try:
-    #     file_list = [name for name in search_dir.iterdir()
-    #                  if name.is_file() or name.is_dir()]
-    # except FileNotFoundError:
-    #     return {}
-
     for path in file_list:
         file_name = path.name
-        if file_name in config.ignore:
-            continue
         if file_name not in comparison:
             comparison[file_name] = {}
 
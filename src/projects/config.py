@@ -1,7 +1,17 @@
+import atexit
+import threading
+import time
+
 from psiconfig import TomlConfig
 
+from projects import logger
 from projects.constants import CONFIG_PATH, DATA_DIR
 
+# Seconds without a further save before pending changes are written
+FLUSH_DELAY = 1.0
+# Seconds after the first pending save by which they are always written
+FLUSH_MAX_DELAY = 10.0
+
 
 DEFAULT_CONFIG = {
     'data_directory': DATA_DIR,
@@ -9,6 +19,7 @@ DEFAULT_CONFIG = {
     'script_directory': '',
     'project_file': 'projects.json',
     'ignore': [],
+    'load_workers': 8,
     'geometry': {
         'frm_main': '1400x600',
         'frm_config': '800x200',
@@ -24,6 +35,95 @@ def read_config() -> TomlConfig:
     return TomlConfig(path=CONFIG_PATH, defaults=DEFAULT_CONFIG)
 
 
+class DeferredConfig():
+    """A TomlConfig whose saves are batched and written later.
+
+    update() changes the config in memory and marks it as pending, and
+    save() only schedules a write. The pending changes are written once
+    the application has been idle for FLUSH_DELAY seconds, at the latest
+    FLUSH_MAX_DELAY seconds after the first of them, by flush() and at
+    exit. Every other attribute is read from the wrapped TomlConfig.
+    """
+
+    def __init__(
+            self,
+            toml_config: TomlConfig,
+            delay: float = FLUSH_DELAY,
+            max_delay: float = FLUSH_MAX_DELAY) -> None:
+        self.toml_config = toml_config
+        self.delay = delay
+        self.max_delay = max_delay
+        self.dirty = False
+        self.requested = 0
+        self.written = 0
+        self._first_pending = 0.0
+        self._timer: threading.Timer = None
+        self._lock = threading.RLock()
+        atexit.register(self.close)
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self.toml_config, name)
+
+    @property
+    def saved_writes(self) -> int:
+        """The number of saves that did not need a write of their own."""
+        return self.requested - self.written
+
+    def update(self, field: str, value: object, force: bool = False) -> None:
+        """Change a value in memory; it is written by the next flush."""
+        with self._lock:
+            self.toml_config.update(field, value, force)
+            if not self.dirty:
+                self.dirty = True
+                self._first_pending = time.monotonic()
+
+    def read(self) -> None:
+        """Re-read the file, unless it is older than the pending changes."""
+        with self._lock:
+            if not self.dirty:
+                self.toml_config.read()
+
+    def save(self) -> int:
+        """Schedule a write of the config."""
+        with self._lock:
+            self.requested += 1
+            now = time.monotonic()
+            if not self.dirty:
+                self.dirty = True
+                self._first_pending = now
+            if self._timer:
+                self._timer.cancel()
+            delay = min(self.delay,
+                        self._first_pending + self.max_delay - now)
+            self._timer = threading.Timer(max(delay, 0), self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+        return self.toml_config.STATUS_OK
+
+    def flush(self) -> int:
+        """Write any pending changes now."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            if not self.dirty:
+                return self.toml_config.STATUS_OK
+            result = self.toml_config.save()
+            self.written += 1
+            self.dirty = False
+            return result
+
+    def close(self) -> None:
+        """Flush the pending changes and log the writes saved."""
+        self.flush()
+        if self.saved_writes:
+            logger.info(
+                "Config writes coalesced",
+                requested=self.requested,
+                written=self.written,
+            )
+
+
 def save_config(config: TomlConfig) -> TomlConfig | None:
     result = config.save()
     if result != config.STATUS_OK:
@@ -32,4 +132,4 @@ def save_config(config: TomlConfig) -> TomlConfig | None:
     return config
 
 
-config = read_config()
+config = DeferredConfig(read_config())
@@ -12,6 +12,10 @@ AUTHOR = 'Jeff Watkins'
 ICON_FILE = Path(Path(__file__).parent, 'images', 'favicon.png')
 
 DATA_FILE = 'projects.json'
+ENV_INDEX_FILE = 'env_index.json'
+SNAPSHOT_FILE = 'snapshot.json'
+IMPORT_CHECK_FILE = 'import_check.json'
+HASH_CACHE_FILE = 'hash_cache.json'
 
 HISTORY_FILE = 'HISTORY.md'
 VERSION_FILE = '_version.py'
@@ -20,5 +24,9 @@ VERSION_TEXT = '__version__'
 PYPROJECT_TOML = 'pyproject.toml'
 REQUIREMENTS_FILE = 'requirements.txt'
 
+# Environment roots
+PYENV_VERSIONS_DIR = Path(Path.home(), '.pyenv', 'versions')
+VENV_ROOT_DIR = Path(Path.home(), 'projects')
+
 CONFIG_PATH = Path(user_config_dir(APP_NAME, AUTHOR), 'config.toml')
 DATA_DIR = str(Path(user_data_dir(APP_NAME, AUTHOR)))
@@ -0,0 +1,111 @@
+"""
+    env_discovery
+    =============
+
+    Locate the site-packages directories of the python environments on this
+    machine without walking their contents.
+
+    Two layouts are recognised:
+
+    - pyenv:  <pyenv_dir>/<version>/lib/pythonX.Y/site-packages
+    - venv:   <venv_root>/.../<project>/.venv/lib/pythonX.Y/site-packages
+
+    Directories are read with os.scandir and only to the depth that these
+    layouts require; everything else is pruned. The number of directories
+    read is reported so that the cost of a scan can be checked.
+"""
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+VENV_DIR = '.venv'
+LIB_DIR = 'lib'
+SITE_PACKAGES = 'site-packages'
+
+# How far below the venv root a project directory may be nested
+VENV_SEARCH_DEPTH = 4
+
+# Directories under the venv root that never hold a project
+PRUNE_DIRS = ('__pycache__', 'node_modules', 'build', 'dist')
+
+
+class SitePackages(NamedTuple):
+    environment: str
+    python_version: str
+    path: str
+
+
+class Discovery(NamedTuple):
+    site_packages: list[SitePackages]
+    visited: int
+
+
+class _Counter():
+    def __init__(self) -> None:
+        self.visited = 0
+
+    def subdirs(self, path: str) -> list[os.DirEntry]:
+        """Return the (non-symlink) subdirectories of path."""
+        self.visited += 1
+        try:
+            with os.scandir(path) as entries:
+                return [entry for entry in entries
+                        if entry.is_dir(follow_symlinks=False)]
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return []
+
+
+def discover(
+        pyenv_dir: Path,
+        venv_root: Path,
+        max_depth: int = VENV_SEARCH_DEPTH) -> Discovery:
+    """Return the site-packages directories under the environment roots."""
+    counter = _Counter()
+    site_packages = []
+    for entry in counter.subdirs(pyenv_dir):
+        site_packages.extend(
+            _site_packages(counter, entry.path, entry.name))
+    site_packages.extend(_venv_site_packages(counter, venv_root, max_depth))
+    return Discovery(site_packages, counter.visited)
+
+
+def list_packages(path: str) -> tuple[list[str], int]:
+    """Return the directory names in a site-packages dir and dirs visited."""
+    counter = _Counter()
+    return [entry.name for entry in counter.subdirs(path)], counter.visited
+
+
+def _venv_site_packages(
+        counter: _Counter, path: str, depth: int) -> list[SitePackages]:
+    site_packages = []
+    subdirs = counter.subdirs(path)
+    for entry in subdirs:
+        if entry.name == VENV_DIR:
+            # A project directory; nothing below it is searched
+            project_name = Path(path).name
+            return _site_packages(counter, entry.path, project_name)
+
+    if depth <= 0:
+        return site_packages
+
+    for entry in subdirs:
+        if entry.name.startswith('.') or entry.name in PRUNE_DIRS:
+            continue
+        site_packages.extend(
+            _venv_site_packages(counter, entry.path, depth - 1))
+    return site_packages
+
+
+def _site_packages(
+        counter: _Counter,
+        env_dir: str,
+        environment: str) -> list[SitePackages]:
+    site_packages = []
+    for entry in counter.subdirs(Path(env_dir, LIB_DIR)):
+        if not entry.name.startswith('python'):
+            continue
+        path = Path(entry.path, SITE_PACKAGES)
+        if path.is_dir():
+            site_packages.append(
+                SitePackages(environment, entry.name, str(path)))
+    return site_packages
@@ -0,0 +1,108 @@
+"""
+    env_index
+    =========
+
+    A workspace-level index of the python environments on this machine.
+
+    The site-packages directories of the environment roots (pyenv versions
+    and project .venvs) are found by env_discovery and every package in
+    them is mapped to the environments that contain it. Projects are then
+    served from the index, so refreshing every project costs one scan
+    rather than one scan per project.
+
+    The index can be persisted. Each site-packages directory is recorded
+    with its mtime and inode, and on the next scan only the directories
+    that have changed are listed again. Environments that have been created
+    or deleted are picked up by discovery.
+"""
+import os
+from pathlib import Path
+
+from projects.constants import PYENV_VERSIONS_DIR, VENV_ROOT_DIR
+from projects.env_version import EnvironmentVersion
+from projects.env_discovery import discover, list_packages
+import projects.projects_io as io
+
+
+class EnvironmentIndex():
+    """Map package names to the environments in which they are installed."""
+
+    def __init__(
+            self,
+            pyenv_dir: Path = PYENV_VERSIONS_DIR,
+            venv_root: Path = VENV_ROOT_DIR,
+            cache_path: Path = None) -> None:
+        self.pyenv_dir = pyenv_dir
+        self.venv_root = venv_root
+        self.cache_path = cache_path
+
+        # site-packages path -> environment, python version, stat, packages
+        self.sites: dict[str, dict] = {}
+        # package name -> environment name -> EnvironmentData tuple
+        self.packages: dict[str, dict[str, tuple]] = {}
+        self.scanned = False
+        self.visited = 0
+        self.rescanned = 0
+
+        if cache_path:
+            self.sites = io.read_json_file(cache_path)
+
+    def scan(self) -> None:
+        """Discover the environments and rebuild the index."""
+        discovery = discover(self.pyenv_dir, self.venv_root)
+        visited = discovery.visited
+        rescanned = 0
+
+        sites = {}
+        for site_packages in discovery.site_packages:
+            try:
+                stat = os.stat(site_packages.path)
+            except FileNotFoundError:
+                continue
+
+            site = self.sites.get(site_packages.path)
+            if (not site
+                    or site['mtime_ns'] != stat.st_mtime_ns
+                    or site['inode'] != stat.st_ino):
+                names, count = list_packages(site_packages.path)
+                visited += count
+                rescanned += 1
+                site = {'packages': sorted(names)}
+
+            site['environment'] = site_packages.environment
+            site['python_version'] = site_packages.python_version
+            site['mtime_ns'] = stat.st_mtime_ns
+            site['inode'] = stat.st_ino
+            sites[site_packages.path] = site
+
+        changed = rescanned or sites.keys() != self.sites.keys()
+        self.sites = sites
+        self.packages = self._build_packages(sites)
+        self.visited = visited
+        self.rescanned = rescanned
+        self.scanned = True
+
+        if changed and self.cache_path:
+            io.update_json_file(self.cache_path, self.sites)
+
+    @staticmethod
+    def _build_packages(sites: dict[str, dict]) -> dict[str, dict[str, tuple]]:
+        packages = {}
+        # Later environments take precedence for environments of the same
+        # name, so venvs override pyenv versions
+        for path, site in sites.items():
+            for name in site['packages']:
+                data = (
+                    site['environment'],
+                    os.path.join(path, name),
+                    site['python_version'])
+                env_versions = packages.setdefault(name, {})
+                env_versions[site['environment']] = data
+        return packages
+
+    def versions(self, name: str) -> dict[str, EnvironmentVersion]:
+        """Return the environments that contain the package name."""
+        if not self.scanned:
+            self.scan()
+        return {key: EnvironmentVersion(data)
+                for key, data in self.packages.get(name, {}).items()}
@@ -3,8 +3,8 @@
     ====================
 
     Provides tools for representing and managing Python virtual environment
-    metadata, including directory paths, Python versions, and version
-    information from a `_version.py` file.
+    metadata, including directory paths, Python versions, and installed
+    package versions.
 
     Classes
     -------
@@ -15,8 +15,7 @@
     EnvironmentVersion
         Represents and manages the details of a Python environment.
         Can serialize/deserialize environment data, locate the
-        environment's Python binary, and extract version numbers from
-        `_version.py` files.
+        environment's Python binary, and resolve the installed version.
 
     Usage Example
     -------------
@@ -35,17 +34,20 @@
 
     Notes
     -----
-    - Version extraction looks for a semantic version pattern (e.g.,
-    '1.2.3') in `_version.py`.
+    - The version is read from the distribution's `*.dist-info` directory,
+    falling back to `_version.py` (see version_resolver).
     - Supports `.venv` and `.pyenv` layouts when locating the Python
     executable.
+    - Instances use __slots__ and the directory is held as an interned
+    parent directory and package name, so the many versions that share
+    a site-packages directory share one copy of its path.
 """
 import os
-import re
+import sys
 from pathlib import Path
 from typing import NamedTuple
 
-from projects.constants import VERSION_FILE
+from projects.version_resolver import resolve
 
 
 class EnvironmentData(NamedTuple):
@@ -61,7 +63,7 @@ class EnvironmentVersion():
 
     __init__:
     Initialize the EnvironmentVersion instance with optional data
-    and set attributes. Deserialize data if provided and get the version.
+    and set attributes. Deserialize data if provided.
 
     serialize:
     Return a tuple of the version for JSON serialization.
@@ -69,27 +71,52 @@ class EnvironmentVersion():
     deserialize:
     Deserialize the version from JSON data.
 
+    version:
+    Property returning the installed version, computed on first access
+    and cached against the (mtime_ns, size) of the file it was read from.
+
+    venv_python:
+    Property returning the path to the environment's Python executable.
+
     _get_version:
-    Get the version from a file in the directory.
+    Get the installed version of the package.
 
     _get_venv_python:
     Get the path to the Python executable in a virtual environment.
 
+    dir:
+    Property returning the package directory, joined from its interned
+    parent directory and name.
+
     dir_short:
     Property method to return a shortened directory path.
     """
+    __slots__ = (
+        'name',
+        'python_version',
+        '_dir_parent',
+        '_dir_name',
+        '_version',
+        '_version_source',
+        '_version_key',
+        '_venv_python',
+    )
 
     def __init__(self, data: EnvironmentData = None) -> None:
         self.name = ''
         self.dir = ''
         self.python_version = ''
-        self.type = ''
+
+        # version and venv_python are computed on first use; the version is
+        # re-read when the stat of the file it came from changes
+        self._version = None
+        self._version_source = None
+        self._version_key = None
+        self._venv_python = None
 
         if data:
             self.deserialize(data)
 
-        self.version = self._get_version()
-
     def serialize(self) -> tuple:
         """Return a tuple of the version for json serialization."""
         return (
@@ -102,23 +129,51 @@ class EnvironmentVersion():
         """Deserialize the version from json."""
         environ = EnvironmentData(*data)
 
-        self.name = environ.name
+        self.name = sys.intern(environ.name)
         self.dir = environ.dir
-        self.python_version = environ.python_version
-        self.version = self._get_version()
-        self.venv_python = self._get_venv_python()
+        self.python_version = sys.intern(environ.python_version)
+        self._version = None
+        self._venv_python = None
+
+    @property
+    def dir(self) -> str:
+        """Return the package directory."""
+        return os.path.join(self._dir_parent, self._dir_name)
 
-    def _get_version(self):
-        version_re = r'[0-9]{1,}.[0-9]{1,}.[0-9]{1,}'
-        path = Path(self.dir, VERSION_FILE)
+    @dir.setter
+    def dir(self, value: str) -> None:
+        parent, name = os.path.split(str(value))
+        self._dir_parent = sys.intern(parent)
+        self._dir_name = sys.intern(name)
+
+    @property
+    def version(self) -> str:
+        """Return the installed version, reading it only when stale."""
+        key = self._stat_key(self._version_source)
+        if self._version is None or key != self._version_key:
+            self._version, self._version_source = self._get_version()
+            self._version_key = self._stat_key(self._version_source)
+        return self._version
+
+    @property
+    def venv_python(self) -> str:
+        """Return the path to the environment's python executable."""
+        if self._venv_python is None:
+            self._venv_python = self._get_venv_python()
+        return self._venv_python
+
+    def _get_version(self) -> tuple[str, Path]:
+        return resolve(self.dir)
+
+    @staticmethod
+    def _stat_key(path: Path) -> tuple[int, int] | None:
+        if path is None:
+            return None
         try:
-            with open(path, 'r', encoding='utf8') as f_version:
-                text = f_version.read()
-                if match := re.search(version_re, text):
-                    return match.group()
-        except FileNotFoundError:
-            return 'No version file'
-        return 'Version error'
+            stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return stat.st_mtime_ns, stat.st_size
 
     def _get_venv_python(self) -> str:
         parts = Path(self.dir).parts
@@ -0,0 +1,68 @@
+"""
+    file_compare
+    ============
+
+    Compare the contents of two files without reading them whole.
+
+    The sizes are compared first, from os.stat, and files of different
+    sizes are never opened. Files of the same size are read in binary
+    chunks of CHUNK_SIZE bytes and the comparison stops at the first chunk
+    that differs. Files of MMAP_THRESHOLD bytes or more are memory mapped
+    rather than read.
+
+    file_hash() returns the sha256 of a file's contents, read in chunks of
+    the same size.
+"""
+import hashlib
+import mmap
+import os
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+
+def same_contents(
+        path_0: Path, path_1: Path, chunk_size: int = CHUNK_SIZE) -> bool:
+    """Return True if the two files have the same contents."""
+    stat_0 = os.stat(path_0)
+    stat_1 = os.stat(path_1)
+    if stat_0.st_size != stat_1.st_size:
+        return False
+    if (stat_0.st_dev, stat_0.st_ino) == (stat_1.st_dev, stat_1.st_ino):
+        return True
+    if not stat_0.st_size:
+        return True
+
+    with open(path_0, 'rb') as f_0, open(path_1, 'rb') as f_1:
+        if stat_0.st_size >= MMAP_THRESHOLD:
+            return _same_mapped(f_0, f_1, stat_0.st_size, chunk_size)
+        return _same_chunks(f_0, f_1, chunk_size)
+
+
+def file_hash(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """Return the sha256 of the file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f_contents:
+        while chunk := f_contents.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _same_chunks(f_0, f_1, chunk_size: int) -> bool:
+    while True:
+        chunk_0 = f_0.read(chunk_size)
+        if chunk_0 != f_1.read(chunk_size):
+            return False
+        if not chunk_0:
+            return True
+
+
+def _same_mapped(f_0, f_1, size: int, chunk_size: int) -> bool:
+    with (mmap.mmap(f_0.fileno(), 0, access=mmap.ACCESS_READ) as map_0,
+          mmap.mmap(f_1.fileno(), 0, access=mmap.ACCESS_READ) as map_1):
+        for start in range(0, size, chunk_size):
+            end = start + chunk_size
+            if map_0[start:end] != map_1[start:end]:
+                return False
+    return True
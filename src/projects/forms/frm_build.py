@@ -8,10 +8,11 @@ from psiutils.widgets import clickable_widget
 from psiutils.constants import PAD, Status
 from psiutils.utilities import window_resize, geometry
 
-from projects.config import config, read_config
+from projects.config import config
 from projects import logger
 
 from projects.build import update_module
+from projects.tasks import TaskRunner
 from projects.text import Text
 
 txt = Text()
@@ -24,7 +25,7 @@ class BuildFrame():
         # pylint: disable=no-member)
         self.root = tk.Toplevel(parent.root)
         self.parent = parent
-        self.config = read_config()
+        self.config = config
 
         self.project = project
 
@@ -33,7 +34,7 @@ class BuildFrame():
         self.current_version = tk.StringVar(value=project.project_version)
         self.pyproject_version = tk.StringVar(value=project.pyproject_version)
         self.new_version = tk.StringVar(value=project.next_version())
-        self.history = tk.StringVar(value=project.new_history)
+        self.history = tk.StringVar(value=project.new_release)
         self.delete_build = tk.IntVar(value=1)
         self.status = tk.StringVar()
         self.test_build = tk.BooleanVar(value=False)
@@ -46,6 +47,7 @@ class BuildFrame():
 
         self.button_frame = None
         self.history_text = None
+        self.tasks = TaskRunner(self.root)
 
         self._show()
 
@@ -65,6 +67,9 @@ class BuildFrame():
         main_frame = self._main_frame(root)
         main_frame.grid(row=1, column=0, sticky=tk.NSEW)
 
+        label = ttk.Label(root, textvariable=self.status)
+        label.grid(row=2, column=0, sticky=tk.W, padx=PAD)
+
         self.button_frame = self._button_frame(root)
         self.button_frame.grid(row=9, column=0, sticky=tk.EW, padx=PAD, pady=PAD)
 
@@ -176,12 +181,23 @@ class BuildFrame():
             'version': self.new_version.get(),
             'current_version': self.current_version.get(),
             'history': self.history_text.get('1.0', 'end'),
-            'current_history': self.project.history,
             'test_build': self.test_build.get(),
             'sync_repository': self.sync_repository.get(),
             'commit_text': self.commit_text.get(),
         }
-        if update_module(context) == Status.OK:
+        self.button_frame.disable()
+        self.tasks.submit(
+            update_module,
+            context,
+            name='build',
+            on_done=self._build_done,
+            on_error=self._build_failed,
+            on_progress=self.status.set,
+            pass_task=True,
+        )
+
+    def _build_done(self, result: int) -> None:
+        if result == Status.OK:
             messagebox.showinfo(
                 'Module update',
                 'Module updated',
@@ -197,7 +213,18 @@ class BuildFrame():
                 'Module not updated',
                 parent=self.root
             )
+        self.project.invalidate_data()
+        self._dismiss()
+
+    def _build_failed(self, error: Exception) -> None:
+        messagebox.showerror(
+            'Module update',
+            f'Module not updated: {error}',
+            parent=self.root
+        )
+        self.project.invalidate_data()
         self._dismiss()
 
     def _dismiss(self):
+        self.tasks.shutdown()
         self.root.destroy()
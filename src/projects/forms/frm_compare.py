@@ -9,10 +9,11 @@ from psiutils.constants import PAD, PADB
 from psiutils.utilities import window_resize, geometry, notify
 from psiutils.buttons import ButtonFrame, IconButton
 
-from projects.compare import compare
-from projects.config import read_config
+from projects.compare import DEEP, compare
+from projects.config import config
 from projects.project import Project
 from projects.env_version import EnvironmentVersion
+from projects.tasks import TaskRunner
 from projects.text import Text
 
 txt = Text()
@@ -30,10 +31,11 @@ class CompareFrame():
         self.project = project
         self.env_version = env_version
 
-        self.config = read_config()
+        self.config = config
 
         self.missing_frame = None
         self.button_frame = None
+        self.tasks = TaskRunner(self.root)
 
         # Tk Variables
         self.project_name = tk.StringVar(value=project.name)
@@ -61,6 +63,7 @@ class CompareFrame():
         root.geometry(geometry(self.config, __file__))
         root.transient(self.parent.root)
         root.bind('<Control-x>', self._dismiss)
+        root.protocol("WM_DELETE_WINDOW", self._dismiss)
         root.bind('<Configure>',
                   lambda event, arg=None: window_resize(self, __file__))
 
@@ -133,9 +136,23 @@ class CompareFrame():
         return frame
 
     def compare_project(self) -> None:
+        """Compare the directories in the background."""
+        self.tasks.cancel_all()
+        self.tasks.submit(
+            compare,
+            self.project.source_dir,
+            self.env_version.dir,
+            mode=DEEP,
+            on_done=self._show_comparison,
+            on_error=self._show_error,
+        )
+
+    def _show_error(self, error: Exception) -> None:
+        messagebox.showerror('', str(error), parent=self.root)
+
+    def _show_comparison(self, comparison: tuple) -> None:
         """Destroy and recreate widgets based on comparison."""
-        (missing, mismatches) = compare(
-            self.project.source_dir, self.env_version.dir)
+        (missing, mismatches) = comparison
 
         for item in self.destroy_widgets:
             item.destroy()
@@ -277,4 +294,5 @@ class CompareFrame():
         self.compare_project()
 
     def _dismiss(self, *args) -> None:
+        self.tasks.shutdown()
         self.root.destroy()
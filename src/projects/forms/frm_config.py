@@ -8,7 +8,7 @@ from psiutils.constants import PAD
 from psiutils.utilities import window_resize, geometry
 
 from projects import logger
-from projects.config import config, read_config
+from projects.config import config
 from projects.text import Text
 
 txt = Text()
@@ -55,7 +55,7 @@ class ConfigFrame():
     def __init__(self, parent):
         # pylint: disable=no-member
         self.root = tk.Toplevel(parent.root)
-        self.config = read_config()
+        self.config = config
         self.parent = parent
         self.ignore_text = None
 
@@ -180,14 +180,14 @@ class ConfigFrame():
                    for field, change in raw_changes.items()}
 
         for field in FIELDS:
-            self.config.config[field] = getattr(self, field).get()
+            self.config.update(field, getattr(self, field).get())
         if 'ignore' in raw_changes:
             self.config.update('ignore', raw_changes['ignore'][1])
 
         logger.info("Config saved", changes=changes)
 
         self._dismiss()
-        return self.config.save()
+        return self.config.flush()
 
     def _config_changes(self) -> dict:
         stored = self.config.config
@@ -210,7 +210,7 @@ class ConfigFrame():
         return changes
 
     def _set_config(self, *args) -> None:
-        self.config = read_config()
+        self.config.read()
         for field in FIELDS:
             getattr(self, field).set(self.config.config[field])
 
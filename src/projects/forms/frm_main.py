@@ -10,16 +10,12 @@ from psiutils.treeview import sort_treeview
 from psiutils.menus import Menu, MenuItem
 from psiutils.utilities import window_resize, geometry
 
-from projects.project_server import ProjectServer
-from projects.config import read_config
-from projects.build import UV_PUBLISH_TOKEN
+from projects.project_server import get_project_server
+from projects.tasks import TaskRunner
+from projects.config import config
 from projects.text import Text
 
 from projects.main_menu import MainMenu
-from projects.forms.frm_project_edit import ProjectEditFrame
-from projects.forms.frm_project_versions import ProjectVersionsFrame
-from projects.forms.frm_build import BuildFrame
-from projects.forms.frm_search import SearchFrame
 
 txt = Text()
 
@@ -45,11 +41,12 @@ class MainFrame():
     def __init__(self, parent):
         self.root = parent.root
         self.parent = parent
-        self.config = read_config()
+        self.config = config
 
-        self.project_server = ProjectServer()
+        self.project_server = get_project_server()
         self.projects = self.project_server.projects
         self.project = None
+        self.tasks = TaskRunner(self.root)
 
         self.tree = None
         self.build_button = None
@@ -150,6 +147,7 @@ class MainFrame():
             return
 
         self.project = self.projects[values[0]]
+        self.project.load_data()
         self.button_frame.enable(True)
         self.context_menu.enable(True)
 
@@ -259,20 +257,26 @@ class MainFrame():
         context_menu.enable(False)
         return context_menu
 
+    # The other forms, and the build machinery, are imported when they are
+    # first used to keep them out of the startup path
+
     def _new_project(self, *args) -> None:
         # pylint: disable=no-member)
+        from projects.forms.frm_project_edit import ProjectEditFrame
         dlg = ProjectEditFrame(self, txt.NEW)
         self.root.wait_window(dlg.root)
         self.update_projects(dlg)
 
     def _edit_project(self, *args) -> None:
         # pylint: disable=no-member)
+        from projects.forms.frm_project_edit import ProjectEditFrame
         dlg = ProjectEditFrame(self, txt.EDIT, self.project)
         self.root.wait_window(dlg.root)
         self.update_projects(dlg)
 
     def _compare_project(self, refresh: bool = False) -> None:
         # pylint: disable=no-member)
+        from projects.forms.frm_project_versions import ProjectVersionsFrame
         dlg = ProjectVersionsFrame(self, txt.EDIT, self.project, refresh)
         self.root.wait_window(dlg.root)
         self.update_projects(dlg)
@@ -309,7 +313,9 @@ class MainFrame():
         self._populate_tree()
 
     def _build_project(self, *args) -> None:
-        if not UV_PUBLISH_TOKEN:
+        from projects.build import publish_token_available
+        from projects.forms.frm_build import BuildFrame
+        if not publish_token_available():
             messagebox.showerror('', 'UV_PUBLISH_TOKEN not set.')
             return
 
@@ -317,7 +323,15 @@ class MainFrame():
         self.root.wait_window(dlg.root)
 
     def _update_pyproject(self, *args) -> None:
-        code = self.project.update_pyproject()
+        self.tasks.submit(
+            self.project.update_pyproject,
+            name=f'update pyproject {self.project.name}',
+            on_done=self._pyproject_updated,
+            on_error=lambda error: messagebox.showerror(
+                '', f'Project not updated - {error}'),
+        )
+
+    def _pyproject_updated(self, code: int) -> None:
         if code == 0:
             messagebox.showinfo('', 'Project updated')
         else:
@@ -353,6 +367,7 @@ class MainFrame():
             )
 
     def _search_for_content(self, * args):
+        from projects.forms.frm_search import SearchFrame
         dlg = SearchFrame(self)
         self.root.wait_window(dlg.root)
 
@@ -10,7 +10,7 @@ from psiutils.utilities import window_resize, geometry
 
 from projects.project import Project
 from projects.constants import APP_TITLE
-from projects.config import read_config
+from projects.config import config
 from projects.text import Text
 from projects import logger
 
@@ -26,7 +26,7 @@ class ProjectEditFrame():
     def __init__(self, parent, mode: int, project: Project = None) -> None:
         self.root = tk.Toplevel(parent.root)
         self.parent = parent
-        self.config = read_config()
+        self.config = config
         self.mode = mode
         self.project = project
         self.projects = parent.projects
@@ -7,6 +7,13 @@ building different development versions of a Python package project.
 It interacts with project configuration data, performs version comparisons,
 and integrates build and compare workflows via modular frames.
 
+The environment scan, comparisons and updates run as background tasks.
+Each environment is listed at once as "comparing…" and its row is updated
+when its result arrives. The overview uses a shallow compare: files that
+differ are listed as before, and files it cannot decide without reading
+them are shown separately as "may differ". CompareFrame verifies the
+contents.
+
 Intended for use within the PSI package build system.
 """
 import subprocess
@@ -19,11 +26,12 @@ from psiutils.buttons import ButtonFrame
 from psiutils.utilities import window_resize, geometry
 
 from projects.project import Project
-from projects.config import read_config
-from projects.compare import compare
+from projects.config import config
+from projects.compare import SHALLOW, compare
 from projects.project_utilities import update_project
-from projects.build import UV_PUBLISH_TOKEN
+from projects.build import publish_token_available
 from projects.constants import VERSION_FILE
+from projects.tasks import Task, TaskRunner
 
 from projects.forms.frm_compare import CompareFrame
 from projects.forms.frm_build import BuildFrame
@@ -33,6 +41,10 @@ FRAME_TITLE = 'Project compare versions'
 DEFAULT_DEV_DIR = str(Path(Path.home(), '.pyenv', 'versions'))
 DEFAULT_PROJECT_DIR = str(Path(Path.home(), 'projects'))
 
+COMPARING = 'comparing…'
+MAY_DIFFER = 'may differ:'
+SCANNING = 'Scanning environments…'
+
 
 class ProjectVersionsFrame():
     """
@@ -48,7 +60,7 @@ class ProjectVersionsFrame():
     Attributes:
         root (tk.Toplevel): The top-level window for this frame.
         parent: The parent window or frame.
-        config (dict): Configuration values loaded via `read_config`.
+        config (DeferredConfig): The application's shared configuration.
         mode (int): Determines whether fields are editable (e.g., `Mode.EDIT`).
         project (Project): The project currently being displayed
             and manipulated.
@@ -85,7 +97,7 @@ class ProjectVersionsFrame():
             refresh: bool = False) -> None:
         self.root = tk.Toplevel(parent.root)
         self.parent = parent
-        self.config = read_config()
+        self.config = config
         self.mode = mode
         self.project = project
         self.project_server = parent.project_server
@@ -96,6 +108,11 @@ class ProjectVersionsFrame():
         self.canvas_frame = None
         self.canvas_frame_id = None
 
+        # pylint: disable=no-member
+        self.tasks = TaskRunner(self.root, workers=config.load_workers)
+        self.compare_tasks: list[Task] = []
+        self.version_buttons: dict[str, ttk.Radiobutton] = {}
+
         if not project.cached_envs:
             refresh = True
         self.refresh = refresh
@@ -140,6 +157,7 @@ class ProjectVersionsFrame():
         root.title(FRAME_TITLE)
         root.transient(self.parent.root)
         root.bind('<Control-x>', self._dismiss)
+        root.protocol("WM_DELETE_WINDOW", self._dismiss)
         root.bind('<Configure>',
                   lambda event, arg=None: window_resize(self, __file__))
 
@@ -242,45 +260,97 @@ class ProjectVersionsFrame():
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
     def _populate_versions_frame(self) -> None:
-        self.project.env_versions = self.project.get_versions(self.refresh)
-        if self.refresh:
-            self.project_server.save_projects()
-        self.refresh = False
+        # Results from an earlier population are discarded
+        for task in self.compare_tasks:
+            task.cancel()
+        self.compare_tasks = []
+        self.version_buttons = {}
 
         for widget in self.canvas_frame.winfo_children():
             widget.destroy()
 
+        if self.refresh:
+            self.refresh = False
+            label = ttk.Label(self.canvas_frame, text=SCANNING)
+            label.grid(row=0, column=0, sticky=tk.W)
+            self.tasks.submit(
+                self._refresh_versions,
+                name='refresh versions',
+                on_done=lambda result: self._versions_refreshed(),
+                on_error=self._show_error,
+            )
+            return
+
+        self.project.env_versions = self.project.get_versions()
         versions = self.project.env_versions
         for row, name in enumerate(sorted(list(versions))):
             version = versions[name]
-            (missing, mismatches) = compare(
-                self.project.source_dir, version.dir)
-
-            mismatch_str = ''
-
-            style = 'green-fg.TRadiobutton'
-            if missing or mismatches:
-                missing_files = self._missing_files(missing)
-                if VERSION_FILE in mismatches:
-                    mismatches.remove(VERSION_FILE)
-
-                style = 'blue-fg.TRadiobutton'
-                if '999' in version.version:
-                    style = 'red-fg.TRadiobutton'
-
-                mismatch_str = self._mismatch_str(missing_files, mismatches)
-
-            display_text = (f'{name} : ({version.version}) '
-                            f'{mismatch_str}')
-
             button = ttk.Radiobutton(
                 self.canvas_frame,
-                text=display_text,
+                text=f'{name} : ({version.version}) {COMPARING}',
                 variable=self.version,
                 value=version.name,
-                style=style,
             )
             button.grid(row=row, column=0, sticky=tk.W)
+            self.version_buttons[name] = button
+
+            self.compare_tasks.append(self.tasks.submit(
+                _shallow_compare,
+                self.project.source_dir,
+                version.dir,
+                name=f'compare {name}',
+                on_done=lambda result, name=name:
+                    self._show_comparison(name, result),
+                on_error=lambda error, name=name:
+                    self._show_compare_error(name, error),
+            ))
+
+    def _refresh_versions(self) -> None:
+        # Runs on a worker thread
+        self.project_server.refresh_versions()
+
+    def _versions_refreshed(self) -> None:
+        # Scheduled on the main window, which outlives this one
+        self.project_server.schedule_save(self.parent.root)
+        self._populate_versions_frame()
+
+    def _show_compare_error(self, name: str, error: Exception) -> None:
+        version = self.project.env_versions[name]
+        self.version_buttons[name].configure(
+            text=f'{name} : ({version.version}) {error}',
+            style='red-fg.TRadiobutton')
+
+    def _show_error(self, error: Exception) -> None:
+        messagebox.showerror('', str(error), parent=self.root)
+
+    def _show_comparison(self, name: str, comparison: tuple) -> None:
+        version = self.project.env_versions[name]
+        (missing, mismatches, undecided) = comparison
+        if VERSION_FILE in undecided:
+            undecided.remove(VERSION_FILE)
+
+        mismatch_str = ''
+
+        style = 'green-fg.TRadiobutton'
+        if missing or mismatches:
+            missing_files = self._missing_files(missing)
+            if VERSION_FILE in mismatches:
+                mismatches.remove(VERSION_FILE)
+
+            style = 'blue-fg.TRadiobutton'
+            if '999' in version.version:
+                style = 'red-fg.TRadiobutton'
+
+            mismatch_str = self._mismatch_str(missing_files, mismatches)
+        elif undecided:
+            # Nothing is known to differ, but these files were not read
+            style = 'orange-fg.TRadiobutton'
+            mismatch_str = self._mismatch_str(
+                [], [MAY_DIFFER] + undecided)
+
+        display_text = (f'{name} : ({version.version}) '
+                        f'{mismatch_str}')
+        self.version_buttons[name].configure(text=display_text, style=style)
 
     def _missing_files(self, missing: list) -> list:
         missing_files = []
@@ -328,18 +398,24 @@ class ProjectVersionsFrame():
 
     def _update_project(self) -> None:
         env_version = self.project.env_versions[self.version.get()]
-        returncode = update_project(
-            self.version.get(), env_version, self.project.name)
-
+        self.tasks.submit(
+            update_project,
+            self.version.get(),
+            env_version,
+            self.project.name,
+            on_done=self._project_updated,
+            on_error=self._show_error,
+        )
+
+    def _project_updated(self, returncode: int) -> None:
         if returncode == 0:
-            self._populate_versions_frame()
-            messagebox.showinfo('', 'Project updated')
+            messagebox.showinfo('', 'Project updated', parent=self.root)
 
         self.refresh = True
         self._populate_versions_frame()
 
     def _build_project(self, *args) -> None:
-        if not UV_PUBLISH_TOKEN:
+        if not publish_token_available():
             messagebox.showerror('', 'UV_PUBLISH_TOKEN not set.')
             return
 
@@ -365,4 +441,13 @@ class ProjectVersionsFrame():
 
         Typically bound to an exit button or key event to _dismiss the frame.
         """
+        self.tasks.shutdown()
         self.root.destroy()
+
+
+def _shallow_compare(source_dir: str, env_dir: str) -> tuple:
+    # Runs on a worker thread
+    undecided = []
+    missing, mismatches = compare(
+        source_dir, env_dir, mode=SHALLOW, undecided=undecided)
+    return (missing, mismatches, undecided)
@@ -1,21 +1,33 @@
-"""SearchFrame for <application>."""
+"""SearchFrame for <application>.
+
+The search runs as a background task that reports each project as it is
+searched; closing the window cancels it.
+"""
 import os
 import re
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk
-from clipboard import copy
+from typing import NamedTuple
 
 from psiutils.constants import PAD
 from psiutils.buttons import ButtonFrame, IconButton
 from psiutils.utilities import window_resize, geometry
 
 from projects.constants import APP_TITLE
-from projects.config import read_config
+from projects.config import config
+from projects.tasks import Task, TaskRunner
 
 FRAME_TITLE = f'{APP_TITLE} - Search for content'
 
 
+class SearchOptions(NamedTuple):
+    text: str
+    file_type: str
+    match_case: bool
+    match_whole_word: bool
+
+
 class SearchFrame():
     """
     Initialize a Search form.
@@ -29,7 +41,7 @@ class SearchFrame():
     def __init__(self, parent: tk.Frame, search_term: str = '') -> None:
         self.root = tk.Toplevel()
         self.parent = parent
-        self.config = read_config()
+        self.config = config
         self.projects = parent.projects
         self.files = []
 
@@ -37,6 +49,7 @@ class SearchFrame():
         self.copy_button = None
         self.found_list = None
         self.found = []
+        self.tasks = TaskRunner(self.root)
 
         # tk variables
         self.search_text = tk.StringVar()
@@ -56,6 +69,7 @@ class SearchFrame():
         root.title(FRAME_TITLE)
         root.transient(self.parent.root)
         root.bind('<Control-x>', self._dismiss)
+        root.protocol("WM_DELETE_WINDOW", self._dismiss)
         root.bind('<Configure>',
                   lambda event, arg=None: window_resize(self, __file__))
 
@@ -149,13 +163,49 @@ class SearchFrame():
         self.search_button.enable(enable)
 
     def _start_process(self, *args) -> None:
+        self.tasks.cancel_all()
         self.copy_button.disable()
         self.found_list.delete('0.0', tk.END)
-        self.found = [
-            project.name
-            for project in self.projects.values()
-            if self._parse_project(project.base_dir)
-        ]
+        options = SearchOptions(
+            self.search_text.get(),
+            self.file_type.get(),
+            self.match_case.get(),
+            self.match_whole_word.get(),
+        )
+        projects = {project.name: project.base_dir
+                    for project in self.projects.values()}
+        self.tasks.submit(
+            self._search,
+            options,
+            projects,
+            on_done=self._show_found,
+            on_error=self._show_message,
+            on_progress=self._show_message,
+            pass_task=True,
+        )
+
+    def _search(
+            self,
+            options: SearchOptions,
+            projects: dict[str, Path],
+            task: Task) -> list[str]:
+        # Runs on a worker thread, so reads no tk variables
+        found = []
+        for count, (name, base_dir) in enumerate(projects.items()):
+            if task.cancelled:
+                break
+            task.report(f'Searching {count + 1} of {len(projects)}: {name}')
+            if self._parse_project(base_dir, options):
+                found.append(name)
+        return found
+
+    def _show_message(self, message: object) -> None:
+        self.found_list.delete('0.0', tk.END)
+        self.found_list.insert('0.0', str(message))
+
+    def _show_found(self, found: list[str]) -> None:
+        self.found = found
+        self.found_list.delete('0.0', tk.END)
         self.found_list.insert('0.0', '\n'.join(sorted(self.found)))
         print(f'{self.found=}')
         if self.found:
@@ -163,41 +213,42 @@ class SearchFrame():
         else:
             self.found_list.insert('0.0', 'No items found')
 
-    def _parse_project(self, search_dir: str) -> bool:
+    def _parse_project(self, search_dir: str, options: SearchOptions) -> bool:
         found = False
         for directory_name, subdir_list, file_list in os.walk(search_dir):
             del subdir_list
             if not self._ignore_path(directory_name):
                 for file_name in file_list:
                     path = Path(directory_name, file_name)
-                    if self.file_type.get() == 'py':
+                    if options.file_type == 'py':
                         if file_name.endswith('.py'):
-                            found = self._contains_search_text(path)
+                            found = self._contains_search_text(path, options)
                     else:
-                        found = self._contains_search_text(path)
+                        found = self._contains_search_text(path, options)
                     if found:
                         return True
         return False
 
-    def _contains_search_text(self, path: str) -> bool:
+    def _contains_search_text(
+            self, path: str, options: SearchOptions) -> bool:
         with open(path, 'r', encoding='utf-8') as f_test:
             file_text = f_test.read()
 
-        search = self.search_text.get()
-        if not self.match_case.get():
+        search = options.text
+        if not options.match_case:
             search = search.lower()
         search_re = rf'\b{re.escape(search)}\b'
 
-        if not self.match_case.get() and not self.match_whole_word.get():
+        if not options.match_case and not options.match_whole_word:
             return search in file_text.lower()
 
-        if self.match_case.get() and not self.match_whole_word.get():
+        if options.match_case and not options.match_whole_word:
             return search in file_text
 
-        if not self.match_case.get() and self.match_whole_word.get():
+        if not options.match_case and options.match_whole_word:
             return re.findall(search_re, file_text.lower())
 
-        if self.match_case.get() and self.match_whole_word.get():
+        if options.match_case and options.match_whole_word:
             return re.findall(search_re, file_text)
 
         return False
@@ -211,7 +262,9 @@ class SearchFrame():
         return any(item in path for item in ignore)
 
     def _copy(self, *args) -> None:
+        from clipboard import copy
         copy('\n'.join(sorted(self.found)))
 
     def _dismiss(self, *args) -> None:
+        self.tasks.shutdown()
         self.root.destroy()
@@ -0,0 +1,102 @@
+"""
+    hash_cache
+    ==========
+
+    A persistent cache of file content hashes.
+
+    Each file's sha256 is stored with the inode, size and mtime_ns that the
+    file had when it was hashed. While those are unchanged the stored hash
+    is used, so an unchanged file is read once however many environments,
+    dialogs and sessions compare it.
+
+    The cache holds at most max_entries files and evicts the least
+    recently used. The application shares one cache, saved in DATA_DIR at
+    exit; use get_hash_cache() rather than creating one.
+"""
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from projects.constants import DATA_DIR, HASH_CACHE_FILE
+from projects.file_compare import file_hash
+import projects.projects_io as io
+
+MAX_ENTRIES = 50_000
+
+
+class HashCache():
+    """sha256 of files keyed on (path, inode, size, mtime_ns)."""
+
+    def __init__(
+            self, path: Path = None, max_entries: int = MAX_ENTRIES) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        # path -> [inode, size, mtime_ns, sha256], least recently used first
+        self.entries: OrderedDict[str, list] = OrderedDict()
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path:
+            self.entries.update(io.read_json_file(path))
+
+    def file_hash(self, path: Path) -> str:
+        """Return the sha256 of the file, hashing it only if it changed."""
+        key = str(path)
+        stat = os.stat(path)
+        stat_key = [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry[:3] == stat_key:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[3]
+
+        digest = file_hash(path)
+        with self._lock:
+            self.misses += 1
+            self.entries[key] = stat_key + [digest]
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.dirty = True
+        return digest
+
+    def cached_hash(self, path: Path) -> str | None:
+        """Return the stored sha256 of the file if it is still valid."""
+        with self._lock:
+            entry = self.entries.get(str(path))
+        if not entry:
+            return None
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if entry[:3] != [stat.st_ino, stat.st_size, stat.st_mtime_ns]:
+            return None
+        return entry[3]
+
+    def save(self) -> None:
+        """Write the cache if it has changed."""
+        if not (self.dirty and self.path):
+            return
+        with self._lock:
+            io.update_json_file(self.path, self.entries)
+            self.dirty = False
+
+
+_hash_cache: HashCache = None
+_hash_cache_lock = threading.Lock()
+
+
+def get_hash_cache() -> HashCache:
+    """Return the process-wide HashCache, loading it on first use."""
+    global _hash_cache  # pylint: disable=global-statement
+    with _hash_cache_lock:
+        if _hash_cache is None:
+            _hash_cache = HashCache(Path(DATA_DIR, HASH_CACHE_FILE))
+            atexit.register(_hash_cache.save)
+        return _hash_cache
@@ -0,0 +1,118 @@
+"""
+    history
+    =======
+
+    Read and update a project's HISTORY.md without loading it whole.
+
+    The file starts with a title line and a blank line, followed by the
+    release entries, newest first:
+
+        Version 1.2.3 - 01 January 2025
+
+        1. A change
+        ------------------------------
+
+    A new release block is inserted after the title by streaming the old
+    file into a temporary file, which then replaces it. The old file is
+    kept as a backup so that a failed build can restore it. Release
+    entries are parsed only when they are asked for.
+"""
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from psiutils.constants import Status
+
+from projects import logger
+
+BACKUP_SUFFIX = '.bak'
+SEPARATOR = '-' * 30
+
+RELEASE_RE = re.compile(r'^Version (\S*) - (.*)$')
+
+
+class Release(NamedTuple):
+    version: str
+    date: str
+    text: str
+
+
+def release_block(version: str, date: datetime = None) -> str:
+    """Return the block for a new release, ready to be edited."""
+    date = (date or datetime.now()).strftime('%d %B %Y')
+    return f'Version {version} - {date}\n\n1. \n{SEPARATOR}\n'
+
+
+def releases(path: Path) -> Iterator[Release]:
+    """Yield the release entries in the file, newest first."""
+    try:
+        with open(path, 'r', encoding='utf8') as f_history:
+            release = None
+            lines = []
+            for line in f_history:
+                if match := RELEASE_RE.match(line.rstrip('\n')):
+                    if release:
+                        yield Release(*release, ''.join(lines).strip('\n'))
+                    release = match.groups()
+                    lines = []
+                elif release:
+                    lines.append(line)
+            if release:
+                yield Release(*release, ''.join(lines).strip('\n'))
+    except FileNotFoundError:
+        return
+
+
+def backup_path(path: Path) -> Path:
+    """Return the path of the file's backup."""
+    path = Path(path)
+    return path.with_name(f'{path.name}{BACKUP_SUFFIX}')
+
+
+def insert_release(path: Path, block: str) -> int:
+    """Insert the release block after the title line of the file."""
+    path = Path(path)
+    block = block.strip('\n')
+    if not block:
+        return Status.OK
+
+    temp_path = path.with_name(f'{path.name}.tmp')
+    try:
+        with open(temp_path, 'w', encoding='utf8') as f_output:
+            if not path.is_file():
+                f_output.write(f'{block}\n')
+                discard_backup(path)
+            else:
+                with open(path, 'r', encoding='utf8') as f_history:
+                    f_output.write(f_history.readline() or '\n')
+                    f_output.write(f'\n{block}\n\n')
+                    # The blank line after the title is replaced above
+                    second_line = f_history.readline()
+                    if second_line.strip():
+                        f_output.write(second_line)
+                    shutil.copyfileobj(f_history, f_output)
+                shutil.copyfile(path, backup_path(path))
+        os.replace(temp_path, path)
+    except OSError as error:
+        logger.warning(f'Cannot update {path}', error=str(error))
+        temp_path.unlink(missing_ok=True)
+        return Status.ERROR
+    return Status.OK
+
+
+def discard_backup(path: Path) -> None:
+    """Remove the file's backup once it is no longer needed."""
+    backup_path(path).unlink(missing_ok=True)
+
+
+def restore(path: Path) -> int:
+    """Replace the file with its backup."""
+    try:
+        os.replace(backup_path(path), path)
+    except FileNotFoundError:
+        logger.warning(f'No backup to restore for {path}')
+        return Status.ERROR
+    return Status.OK
@@ -1,19 +1,31 @@
 """Main procedure for package"""
+import sys
 from pathlib import Path
 
 from psiutils.icecream_init import ic_init
 
-from projects.modules import check_imports
-from projects.root import Root
+from projects.modules import check_imports_in_background
 
 ic_init()
 
 
-def main() -> None:
-    """Call the Root loop."""
-    check_imports('projects', Path(__file__).parent)
-    Root()
+def main(argv: list[str] = None) -> int:
+    """Call the Root loop, or run a command given on the command line.
+
+    'compare' runs the batch compare without the GUI.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['compare']:
+        # pylint: disable=import-outside-toplevel
+        from projects.batch_compare import main as batch_compare
+        return batch_compare(argv[1:])
+
+    # Imported here so that commands do not load the forms
+    from projects.root import Root  # pylint: disable=import-outside-toplevel
+    Root(on_idle=lambda: check_imports_in_background(
+        'projects', Path(__file__).parent))
+    return 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -8,10 +8,6 @@ from projects.constants import AUTHOR, APP_TITLE
 from projects._version import __version__
 from projects.text import Text
 
-from projects.forms.frm_config import ConfigFrame
-from projects.forms.frm_project_edit import ProjectEditFrame
-from projects.forms.frm_search import SearchFrame
-
 
 txt = Text()
 SPACES = ' '*20
@@ -63,6 +59,7 @@ class MainMenu():
 
     def _config_frame(self) -> None:
         """Display the config frame."""
+        from projects.forms.frm_config import ConfigFrame
         dlg = ConfigFrame(self)
         self.root.wait_window(dlg.root)
 
@@ -74,12 +71,14 @@ class MainMenu():
 
     def _new_project(self, *args) -> None:
         # pylint: disable=no-member)
+        from projects.forms.frm_project_edit import ProjectEditFrame
         dlg = ProjectEditFrame(self, Mode.NEW)
         self.root.wait_window(dlg.root)
         self.parent.update_projects(dlg)
         self.status = dlg.status
 
     def _search_for_content(self, * args):
+        from projects.forms.frm_search import SearchFrame
         dlg = SearchFrame(self)
         self.root.wait_window(dlg.root)
 
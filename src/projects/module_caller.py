@@ -2,11 +2,7 @@ import sys
 
 from psiutils.constants import Mode
 
-from projects.project_server import ProjectServer
-from projects.forms.frm_config import ConfigFrame
-from projects.forms.frm_project_edit import ProjectEditFrame
-from projects.forms.frm_build import BuildFrame
-from projects.forms.frm_search import SearchFrame
+from projects.project_server import get_project_server
 
 # from projects.github import upload
 
@@ -20,7 +16,8 @@ class ModuleCaller():
             'build': self._build,
             # 'github': self._github,
             }
-        self.projects = ProjectServer().projects
+        self.project_server = get_project_server()
+        self.projects = self.project_server.projects
 
         self.invalid = False
         if module == '-h':
@@ -40,20 +37,25 @@ class ModuleCaller():
         self.root.destroy()
         return
 
+    # Each form is imported only when its module is called
+
     def _config(self) -> None:
+        from projects.forms.frm_config import ConfigFrame
         dlg = ConfigFrame(self)
         self.root.wait_window(dlg.root)
 
     def _project(self) -> None:
-        self.project_server = ProjectServer()
+        from projects.forms.frm_project_edit import ProjectEditFrame
         dlg = ProjectEditFrame(self, Mode.EDIT, self.projects['psiutils'])
         self.root.wait_window(dlg.root)
 
     def _build(self) -> None:
+        from projects.forms.frm_build import BuildFrame
         dlg = BuildFrame(self, self.projects['bfgbidding'])
         self.root.wait_window(dlg.root)
 
     def _search(self) -> None:
+        from projects.forms.frm_search import SearchFrame
         search_term = sys.argv[2] if len(sys.argv) > 2 else ''
         dlg = SearchFrame(self, search_term)
         self.root.wait_window(dlg.root)
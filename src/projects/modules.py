@@ -1,66 +1,166 @@
-"""Log any imports that do not have an explicit package reference."""
+"""Log any imports that do not have an explicit package reference.
 
+Each file is parsed once with ast and every import node is resolved
+against the package's module names with set lookups.
+
+The results for each file are cached in DATA_DIR keyed on the file's
+content hash, so only files that have changed are checked again.
+"""
+
+import ast
+import hashlib
 import os
+import threading
 from pathlib import Path
-import re
+from typing import NamedTuple
 
 from projects import logger
+from projects.constants import DATA_DIR, IMPORT_CHECK_FILE
+import projects.projects_io as io
 
 
 TEST_DIR = '/home/jeff/projects/utilities/projects/src/projects'
 
-STARTS_WITH = ('from', 'import')
 IMPORTS = (
     'psiutils',
 )
 
+CACHE_PATH = Path(DATA_DIR, IMPORT_CHECK_FILE)
+CACHE_VERSION = 2
+_cache_lock = threading.Lock()
+
 
-def check_imports(package: str, source_dir: str) -> None:
-    modules = _get_modules(source_dir)
-    for path in modules.values():
-        text = _get_text(path)
-        _check_imports(list(modules), package, source_dir, path.stem, text)
+class ImportFinding(NamedTuple):
+    file: str
+    line: int
+    statement: str
 
 
-def _get_modules(module_dir: str) -> dict:
-    modules = {}
+def check_imports(
+        package: str,
+        source_dir: str,
+        cache_path: Path = CACHE_PATH) -> list[ImportFinding]:
+    """Return, and log, imports without an explicit package reference."""
+    paths = _get_module_paths(source_dir)
+    modules = sorted({path.stem for path in paths})
+    findings = []
+    with _cache_lock:
+        cache = io.read_json_file(cache_path) if cache_path else {}
+        package_cache = cache.get(package, {})
+        if (package_cache.get('version') != CACHE_VERSION
+                or package_cache.get('modules') != modules):
+            # The findings depend on the set of modules in the package
+            package_cache = {
+                'version': CACHE_VERSION,
+                'modules': modules,
+                'files': {},
+            }
+        files = package_cache['files']
+
+        changed = False
+        checked = {}
+        module_names = set(modules)
+        for path in paths:
+            entry = files.get(str(path))
+            new_entry = _check_file(module_names, package, path, entry)
+            changed = changed or new_entry is not entry
+            checked[str(path)] = new_entry
+            findings.extend(
+                ImportFinding(str(path), line, statement)
+                for line, statement in new_entry['findings'])
+
+        changed = changed or checked.keys() != files.keys()
+        if changed and cache_path:
+            package_cache['files'] = checked
+            cache[package] = package_cache
+            io.update_json_file(cache_path, cache)
+
+    for finding in findings:
+        logger.warning(
+            f'Missing package definition in {finding.file}: {finding.line}',
+            statement=finding.statement,
+        )
+    return findings
+
+
+def check_imports_in_background(
+        package: str, source_dir: str) -> threading.Thread:
+    """Run check_imports on a daemon thread and return the thread."""
+    thread = threading.Thread(
+        target=check_imports, args=(package, source_dir), daemon=True)
+    thread.start()
+    return thread
+
+
+def _check_file(
+        modules: set,
+        package: str,
+        path: Path,
+        entry: dict | None) -> dict:
+    """Return the cache entry for path, checking it only if it changed."""
+    stat = path.stat()
+    stat_key = [stat.st_mtime_ns, stat.st_size]
+    if entry and entry['stat'] == stat_key:
+        return entry
+
+    with open(path, 'rb') as f_module:
+        content = f_module.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if entry and entry['hash'] == digest:
+        return {**entry, 'stat': stat_key}
+
+    findings = _check_imports(modules, package, content.decode('utf-8'))
+    return {'stat': stat_key, 'hash': digest, 'findings': findings}
+
+
+def _get_module_paths(module_dir: str) -> list[Path]:
+    paths = []
     for directory_name, subdir_list, file_list in os.walk(module_dir):
         del subdir_list
         for file_name in file_list:
             file_path = Path(directory_name, file_name)
             if file_path.suffix == '.py':
-                modules[file_path.stem] = file_path
-    return modules
-
-
-def _get_text(path: str) -> list:
-    with open(path, 'r', encoding='utf-8') as f_module:
-        return f_module.read().split('\n')
+                paths.append(file_path)
+    return paths
 
 
 def _check_imports(
-        modules: list,
+        modules: set,
         package: str,
-        source_dir: str,
-        module_name: str,
-        text: list) -> None:
-    """Log any imports that do not have an explicit package reference."""
-    for index, line in enumerate(text):
-        import_line = any(line.startswith(start) for start in STARTS_WITH)
-        if not import_line:
+        source: str) -> list[tuple[int, str]]:
+    """Return imports that do not have an explicit package reference."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as error:
+        logger.warning('Imports not checked', error=str(error))
+        return []
+
+    findings = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                # Relative imports never name the package
+                findings.append((node.lineno, _statement(source, node)))
+                continue
+            names = [node.module]
+        else:
             continue
 
-        imported_package = (line.split()[1]).split('.')[0]
-        if imported_package in IMPORTS:
-            continue
+        for name in names:
+            top_level = name.split('.')[0]
+            if top_level in IMPORTS or top_level == package:
+                continue
+            if top_level in modules:
+                findings.append((node.lineno, _statement(source, node)))
+                break
+    return sorted(findings)
+
 
-        for module in modules:
-            module_re = rf'\b{module}\b'
-            if re.search(module_re, line) and f'{package}.' not in line:
-                print(module_name, module, line)
-                logger.warning(
-                    (f'Missing package definition in '
-                     f'{source_dir}/{module_name}: {index+1}'))
+def _statement(source: str, node: ast.AST) -> str:
+    segment = ast.get_source_segment(source, node) or ''
+    return ' '.join(segment.split())
 
 
 if __name__ == "__main__":
@@ -1,19 +1,23 @@
 """Project data for Compare."""
-import os
 from pathlib import Path
-from datetime import datetime
 import re
 import subprocess
+import threading
+from typing import Iterator
 
 from psiutils.constants import Status
 from psi_toml.parser import TomlParser
 
 from projects import logger
 from projects.env_version import EnvironmentVersion
+from projects.env_index import EnvironmentIndex
+from projects.snapshot import ProjectSnapshot, stat_key
+from projects.history import Release
 from projects.constants import (
     PYPROJECT_TOML, HISTORY_FILE, VERSION_FILE, VERSION_TEXT)
 
 import projects.projects_io as io
+import projects.history as history
 
 
 class Project():
@@ -21,6 +25,30 @@ class Project():
 
     # base_dir is the base directory containing, e.g. HISTORY.md
 
+    # No history text is held: HISTORY.md is only read, or streamed,
+    # when a project is built
+    __slots__ = (
+        'name',
+        'source_dir',
+        '_source_dir_short',
+        '_base_dir',
+        'env_dir',
+        '_env_dir_short',
+        'env_versions',
+        'cached_envs',
+        '_version_text',
+        'script',
+        'repository_name',
+        'pypi',
+        'build_for_windows',
+        'snapshot',
+        '_load_lock',
+        '_versions_loaded',
+        '_project_version',
+        '_pyproject_version',
+        '_py_project_missing',
+    )
+
     def __init__(self) -> None:
         """
             Initializes a Projects object.
@@ -38,20 +66,25 @@ class Project():
         self._base_dir: Path = None
         self.env_dir: str = ''
         self._env_dir_short: str = ''
-        self.project_version: str = ''
-        self.pyproject_version: str = ''
-        self.history = ''
-        self.new_history = ''
-        self._pyproject_list = []
         self.env_versions: dict = {}
         self.cached_envs = {}
-        self.py_project_missing = True
         self._version_text = ''
         self.script: str = ''
         self.repository_name: str = ''
         self.pypi = False
         self.build_for_windows = False
 
+        # Data read from the project's files, loaded on first use.
+        # The version data can be restored from a ProjectSnapshot.
+        self.snapshot: ProjectSnapshot = None
+        # Held while the version data is read, so that a reader on another
+        # thread waits for it rather than seeing it half loaded
+        self._load_lock = threading.Lock()
+        self._versions_loaded = False
+        self._project_version: str = ''
+        self._pyproject_version: str = ''
+        self._py_project_missing = True
+
     def __repr__(self) -> str:
         """
         Returns a string representation of the Projects object.
@@ -154,14 +187,32 @@ class Project():
         """Return path to pyprojects file."""
         return Path(self.base_dir, PYPROJECT_TOML)
 
-    def _get_new_history(self) -> str:
-        if not self.history:
-            return []
-        history = self.history.split('\n')
-        date = datetime.now().strftime('%d %B %Y')
-        version = f'Version {self.next_version()} - {date}'
-        insertion = ['', version, '', '1. ', '-'*30, '']
-        return '\n'.join([history[0]] + insertion + history[2:])
+    @property
+    def project_version(self) -> str:
+        """Return the version in the project's version file."""
+        self._load_versions()
+        return self._project_version
+
+    @property
+    def pyproject_version(self) -> str:
+        """Return the version in the project's pyproject.toml."""
+        self._load_versions()
+        return self._pyproject_version
+
+    @property
+    def new_release(self) -> str:
+        """Return the history block for the next version."""
+        return history.release_block(self.next_version())
+
+    def releases(self) -> Iterator[Release]:
+        """Yield the release entries in the history file, newest first."""
+        return history.releases(self.history_path)
+
+    @property
+    def py_project_missing(self) -> bool:
+        """Return True if the project has no pyproject.toml."""
+        self._load_versions()
+        return self._py_project_missing
 
     def next_version(self) -> str:
         """Return the next version string."""
@@ -195,16 +246,15 @@ class Project():
 
     def _get_pyproject_version(self) -> str:
         default = '-.-.-'
-        self.py_project_missing = False
+        self._py_project_missing = False
 
         pyproject_text = io.read_text_file(self.pyproject_path)
         if pyproject_text == Status.ERROR:
-            self.py_project_missing = True
+            self._py_project_missing = True
             print(f'pyproject.toml missing {self.pyproject_path}')
             return default
 
-        self._pyproject_list = pyproject_text.split('\n')
-        for line in self._pyproject_list:
+        for line in pyproject_text.split('\n'):
             if 'version =' in line:
                 line_list = line.split('=')
                 if len(line_list) != 2:
@@ -216,19 +266,61 @@ class Project():
 
     def get_project_data(self) -> None:
         """Update project attributes."""
-        self.project_version = self._get_project_version()
-        self.history = io.read_text_file(self.history_path)
-        if self.history == Status.ERROR:
-            self.history = ''
-        self.new_history = self._get_new_history()
-        self.pyproject_version = self._get_pyproject_version()
+        with self._load_lock:
+            self._get_version_data()
+
+    def load_data(self) -> None:
+        """Read the project's files if they have not been read yet."""
+        self._load_versions()
+
+    def invalidate_data(self) -> None:
+        """Discard data read from the project's files."""
+        self._versions_loaded = False
+        self._version_text = ''
+
+    def _load_versions(self) -> None:
+        if self._versions_loaded:
+            return
+        with self._load_lock:
+            # Another thread may have loaded them while this one waited
+            if not self._versions_loaded:
+                self._get_version_data()
+
+    def _get_version_data(self) -> None:
+        # The flag is set only once the values are assigned
+        key = None
+        if self.snapshot:
+            key = stat_key(self.version_path, self.pyproject_path)
+            if values := self.snapshot.get(self.name, key):
+                self._project_version = values['project_version']
+                self._pyproject_version = values['pyproject_version']
+                self._py_project_missing = values['py_project_missing']
+                self._versions_loaded = True
+                return
+
+        self._project_version = self._get_project_version()
+        self._pyproject_version = self._get_pyproject_version()
+        self._versions_loaded = True
+
+        if self.snapshot:
+            self.snapshot.put(self.name, key, {
+                'project_version': self._project_version,
+                'pyproject_version': self._pyproject_version,
+                'py_project_missing': self._py_project_missing,
+            })
 
     def update_version(self, version: str) -> int:
         output = f'{VERSION_TEXT} = \'{version}\''
         return io.update_file(self.version_path, output)
 
     def update_pyproject_version(self, version: str) -> int:
-        for index, line in enumerate(self._pyproject_list):
+        pyproject_text = io.read_text_file(self.pyproject_path)
+        if pyproject_text == Status.ERROR:
+            return Status.ERROR
+
+        pyproject_list = pyproject_text.split('\n')
+        output = pyproject_list
+        for index, line in enumerate(pyproject_list):
             if 'version =' in line:
                 line_list = line.split('=')
                 if len(line_list) != 2:
@@ -236,70 +328,46 @@ class Project():
                     return Status.ERROR
                 version_text = f'{line_list[0].strip()} = "{version}"'
 
-                output = self._pyproject_list[:index]
+                output = pyproject_list[:index]
                 output.append(version_text)
-                output.extend(self._pyproject_list[index+1:])
+                output.extend(pyproject_list[index+1:])
                 break
 
         return io.update_file(self.pyproject_path, '\n'.join(output))
 
-    def update_history(self, history: str) -> int:
-        return io.update_file(self.history_path, history)
+    def update_history(self, release: str) -> int:
+        """Insert the release block at the top of the history file."""
+        return history.insert_release(self.history_path, release)
+
+    def restore_history(self) -> int:
+        """Restore the history file as it was before update_history."""
+        return history.restore(self.history_path)
+
+    def discard_history_backup(self) -> None:
+        """Remove the backup made by update_history."""
+        history.discard_backup(self.history_path)
 
     def get_versions(
-            self, refresh: bool = False) -> list[dict[EnvironmentVersion]]:
-        """Return a list of environment versions of the project."""
+            self,
+            refresh: bool = False,
+            env_index: EnvironmentIndex = None,
+            ) -> dict[str, EnvironmentVersion]:
+        """Return a dict of environment versions of the project.
+
+        On refresh the versions are taken from env_index. If it is not
+        supplied, the whole pyenv and venv workspace is scanned into a new
+        index that is not saved, so pass the shared
+        ProjectServer.env_index.
+        """
         if not refresh:
             return self.cached_envs
 
-        env_versions = {}  # dict of EnvironmentVersion
-
-        pyenv_dir = Path(Path.home(), '.pyenv', 'versions')
-        pyenv_versions = self._get_versions_from_dir(pyenv_dir)
-
-        venv_dir = Path(Path.home(), 'projects')
-        venv_versions = self._get_versions_from_dir(venv_dir)
-
-        env_versions = {**pyenv_versions, **venv_versions}
-        self.cached_envs = env_versions
-        return env_versions
-
-    def _get_versions_from_dir(self, path: str) -> dict:
-        env_versions = {}  # dict of EnvironmentVersion
-
-        for directory, subdirs, files in os.walk(path, followlinks=False):
-            del subdirs, files
-            project_name_index, environment_index = 0, 0
-
-            if not Path(directory).is_dir():
-                continue
-
-            parts = Path(directory).parts
-            if '.venv' in parts:
-                start_index = parts.index('.venv')
-                project_name_index = start_index + 4
-                environment_index = start_index - 1
-                python_version_index = start_index + 2
-            elif '.pyenv' in parts:
-                start_index = parts.index('.pyenv')
-                project_name_index = start_index + 6
-                environment_index = start_index + 2
-                python_version_index = start_index + 4
-            else:
-                continue
-
-            if len(parts) <= project_name_index:
-                continue
+        if env_index is None:
+            env_index = EnvironmentIndex()
+            env_index.scan()
 
-            if self.name == parts[project_name_index]:
-                environment_name = parts[environment_index]
-                if environment_name not in env_versions:
-                    data = (
-                        environment_name,
-                        directory,
-                        parts[python_version_index])
-                    env_versions[environment_name] = EnvironmentVersion(data)
-        return env_versions
+        self.cached_envs = env_index.versions(self.name)
+        return self.cached_envs
 
     def update_pyproject(self) -> int:
         """Create a requirements.txt and update pyproject.tom accordingly."""
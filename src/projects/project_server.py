@@ -1,11 +1,31 @@
-"""Project server for package application."""
+"""Project server for package application.
+
+The application shares one ProjectServer per process; use
+get_project_server() rather than creating one.
+
+The projects are changed on the Tk thread, so a scheduled save is run
+there too, through root.after, and never serializes them while a form
+is changing them.
+"""
+import atexit
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from psiutils.constants import Status
+
+from projects import logger
 from projects.config import config
 from projects.project import Project
 from projects.env_version import EnvironmentVersion
-from projects.constants import DATA_DIR
-import projects.projects_io as io
+from projects.env_index import EnvironmentIndex
+from projects.snapshot import ProjectSnapshot
+from projects.project_store import open_store
+from projects.constants import DATA_DIR, ENV_INDEX_FILE, SNAPSHOT_FILE
+
+# Seconds to wait for further changes before a scheduled save is written
+SAVE_DELAY = 2.0
 
 
 class ProjectServer():
@@ -13,14 +33,43 @@ class ProjectServer():
     def __init__(self) -> None:
         # pylint: disable=no-member
         self.project_file = Path(DATA_DIR, config.project_file)
+        self.store = open_store(self.project_file)
+        self.env_index = EnvironmentIndex(
+            cache_path=Path(DATA_DIR, ENV_INDEX_FILE))
+        if self.store.has_metadata:
+            self.snapshot = ProjectSnapshot(store=self.store)
+        else:
+            self.snapshot = ProjectSnapshot(Path(DATA_DIR, SNAPSHOT_FILE))
+        atexit.register(self.snapshot.save)
+
+        # The JSON of each project as last read or written
+        self._saved: dict[str, str] = {}
+        self._save_lock = threading.Lock()
+        # (root, after id) of the scheduled save
+        self._scheduled_save: tuple = None
+        atexit.register(self.flush_save)
         self.projects = self._get_projects()
 
+    def reload(self) -> None:
+        """Re-read the projects file, keeping the same projects dict."""
+        projects = self._get_projects()
+        self.projects.clear()
+        self.projects.update(projects)
+
+    def invalidate(self, name: str = '') -> None:
+        """Discard the file data loaded for a project, or for all."""
+        projects = [self.projects[name]] if name else self.projects.values()
+        for project in projects:
+            project.invalidate_data()
+
     def _get_projects(self) -> dict[str, Project]:
         project_dict = {}
-        projects_raw = io.read_json_file(self.project_file)
+        projects_raw = self.store.read()
+        self._saved = _encode(projects_raw)
         for key, item in projects_raw.items():
             project = Project()
             project.name = key
+            project.snapshot = self.snapshot
             project_dict[key] = project
 
             project.source_dir = item['dir']
@@ -35,13 +84,128 @@ class ProjectServer():
                                    in item['cached_envs'].items()}
             if 'script' in item:
                 project.script = item['script']
-            project.get_project_data()
         return project_dict
 
+    def load_project_data(self, workers: int = 0) -> dict[str, Exception]:
+        """Read every project's files on a thread pool.
+
+        Returns the errors raised while loading, keyed on project name.
+        """
+        # pylint: disable=no-member
+        workers = max(1, workers or config.load_workers)
+        errors = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(project.load_data): name
+                for name, project in self.projects.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    errors[name] = error
+                    logger.warning(
+                        "Project data not loaded",
+                        project=name,
+                        error=str(error),
+                    )
+        self.snapshot.save()
+        return errors
+
+    def refresh_versions(self) -> None:
+        """Scan the environments once and refresh every project."""
+        self.env_index.scan()
+        # This may run on a worker thread; each project's cached_envs is
+        # replaced, not changed in place
+        for project in list(self.projects.values()):
+            project.get_versions(True, self.env_index)
+
     def save_projects(self, projects: dict[str, Project] = None) -> int:
         if not projects:
             projects = self.projects
-        self.projects = projects
-        output = {name: project.serialize()
-                  for name, project in projects.items()}
-        return io.update_json_file(self.project_file, output)
+        if projects is not self.projects:
+            # Other forms hold a reference to self.projects
+            self.projects.clear()
+            self.projects.update(projects)
+            projects = self.projects
+        self._cancel_save()
+        for name in list(self.snapshot.entries):
+            if name not in projects:
+                self.snapshot.discard(name)
+        self.snapshot.save()
+
+        with self._save_lock:
+            output = {name: project.serialize()
+                      for name, project in projects.items()}
+            changed = self.changed_projects(output)
+            if not changed:
+                return Status.OK
+            result = self.store.write(output, changed)
+            if result == Status.OK:
+                self._saved = _encode(output)
+            return result
+
+    def changed_projects(self, output: dict[str, dict] = None) -> list[str]:
+        """Return the names of projects added, changed or removed since
+        the projects file was last read or written."""
+        if output is None:
+            output = {name: project.serialize()
+                      for name, project in self.projects.items()}
+        encoded = _encode(output)
+        names = encoded.keys() | self._saved.keys()
+        return sorted(name for name in names
+                      if encoded.get(name) != self._saved.get(name))
+
+    def schedule_save(self, root: object, delay: float = SAVE_DELAY) -> None:
+        """Save the projects once no further save is scheduled for delay
+        seconds; call from the Tk thread, which runs the save.
+
+        root is any object with Tk's after and after_cancel methods.
+        """
+        self._cancel_save()
+        with self._save_lock:
+            after_id = root.after(int(delay * 1000), self._run_scheduled_save)
+            self._scheduled_save = (root, after_id)
+
+    def _run_scheduled_save(self) -> None:
+        with self._save_lock:
+            self._scheduled_save = None
+        self.save_projects()
+
+    def flush_save(self) -> None:
+        """Write a scheduled save now."""
+        if self._cancel_save():
+            self.save_projects()
+
+    def _cancel_save(self) -> bool:
+        with self._save_lock:
+            scheduled, self._scheduled_save = self._scheduled_save, None
+        if not scheduled:
+            return False
+        root, after_id = scheduled
+        try:
+            root.after_cancel(after_id)
+        except Exception:  # pylint: disable=broad-except
+            # The window has been destroyed (a TclError); tkinter is not
+            # imported here so that the server can run without it
+            pass
+        return True
+
+
+def _encode(output: dict[str, dict]) -> dict[str, str]:
+    return {name: json.dumps(item, sort_keys=True)
+            for name, item in output.items()}
+
+
+_project_server: ProjectServer = None
+_project_server_lock = threading.Lock()
+
+
+def get_project_server() -> ProjectServer:
+    """Return the process-wide ProjectServer, loading it on first use."""
+    global _project_server  # pylint: disable=global-statement
+    with _project_server_lock:
+        if _project_server is None:
+            _project_server = ProjectServer()
+        return _project_server
@@ -0,0 +1,226 @@
+"""
+    project_store
+    =============
+
+    Storage for the serialized projects.
+
+    The store is chosen from the suffix of config.project_file:
+
+    - .json:            the projects are a single JSON document that is
+                        rewritten on every save;
+    - .db, .sqlite:     the projects are rows in an SQLite database, with
+                        their environments and derived metadata in
+                        indexed tables of their own, so saving a project
+                        only writes that project's rows.
+
+    A new database is populated once from the projects.json in the same
+    directory, if there is one.
+"""
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from psiutils.constants import Status
+
+from projects import logger
+from projects.constants import DATA_FILE
+import projects.projects_io as io
+
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS projects (
+        name TEXT PRIMARY KEY,
+        dir TEXT NOT NULL,
+        pypi INTEGER NOT NULL DEFAULT 0,
+        repository TEXT NOT NULL DEFAULT '',
+        build_for_windows INTEGER NOT NULL DEFAULT 0,
+        script TEXT NOT NULL DEFAULT ''
+    );
+    CREATE TABLE IF NOT EXISTS environments (
+        project TEXT NOT NULL
+            REFERENCES projects (name) ON DELETE CASCADE,
+        environment TEXT NOT NULL,
+        dir TEXT NOT NULL,
+        python_version TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (project, environment)
+    );
+    CREATE INDEX IF NOT EXISTS environments_environment
+        ON environments (environment);
+    CREATE TABLE IF NOT EXISTS metadata (
+        project TEXT PRIMARY KEY,
+        key TEXT NOT NULL,
+        project_values TEXT NOT NULL
+    );
+"""
+
+
+def open_store(path: Path) -> 'JsonProjectStore | SqliteProjectStore':
+    """Return the store for the project file."""
+    path = Path(path)
+    if path.suffix in SQLITE_SUFFIXES:
+        return SqliteProjectStore(path, Path(path.parent, DATA_FILE))
+    return JsonProjectStore(path)
+
+
+class JsonProjectStore():
+    """Projects held in a single JSON document."""
+    has_metadata = False
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def read(self) -> dict[str, dict]:
+        """Return the serialized projects keyed on name."""
+        return io.read_json_file(self.path)
+
+    def write(self, projects: dict[str, dict], changed: list[str]) -> int:
+        """Write the projects; the whole document is always rewritten."""
+        del changed
+        return io.update_json_file(self.path, projects)
+
+
+class SqliteProjectStore():
+    """Projects held as rows in an SQLite database."""
+    has_metadata = True
+
+    def __init__(self, path: Path, migrate_from: Path = None) -> None:
+        self.path = Path(path)
+        is_new = not self.path.exists()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(SCHEMA)
+            connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        if is_new and migrate_from and Path(migrate_from).is_file():
+            self.migrate(migrate_from)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per operation: project saves come from the Tk
+        # thread, but snapshot saves can come from atexit or a worker
+        # thread, and a connection is not shared across threads
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA foreign_keys = ON')
+        return connection
+
+    def migrate(self, json_path: Path) -> int:
+        """Copy the projects in a projects.json into the database."""
+        projects = io.read_json_file(json_path)
+        result = self.write(projects, list(projects))
+        if result == Status.OK:
+            logger.info(
+                "Projects migrated",
+                source=str(json_path),
+                destination=str(self.path),
+                projects=len(projects),
+            )
+        return result
+
+    def read(self) -> dict[str, dict]:
+        """Return the serialized projects keyed on name."""
+        projects = {}
+        with closing(self._connect()) as connection:
+            for row in connection.execute(
+                    'SELECT name, dir, pypi, repository, build_for_windows,'
+                    ' script FROM projects ORDER BY rowid'):
+                name, source_dir, pypi, repository, for_windows, script = row
+                projects[name] = {
+                    'dir': source_dir,
+                    'pypi': bool(pypi),
+                    'repository': repository,
+                    'build_for_windows': bool(for_windows),
+                    'cached_envs': {},
+                    'script': script,
+                }
+            for project, environment, env_dir, python_version in (
+                    connection.execute(
+                        'SELECT project, environment, dir, python_version'
+                        ' FROM environments ORDER BY rowid')):
+                projects[project]['cached_envs'][environment] = [
+                    environment, env_dir, python_version]
+        return projects
+
+    def write(self, projects: dict[str, dict], changed: list[str]) -> int:
+        """Write the rows of the changed projects only."""
+        try:
+            with closing(self._connect()) as connection, connection:
+                for name in changed:
+                    connection.execute(
+                        'DELETE FROM environments WHERE project = ?', (name,))
+                    if name not in projects:
+                        connection.execute(
+                            'DELETE FROM projects WHERE name = ?', (name,))
+                        continue
+                    self._write_project(connection, name, projects[name])
+            return Status.OK
+        except sqlite3.Error as error:
+            logger.warning(
+                "Projects not saved",
+                path=str(self.path),
+                error=str(error),
+            )
+            return Status.ERROR
+
+    @staticmethod
+    def _write_project(
+            connection: sqlite3.Connection, name: str, item: dict) -> None:
+        connection.execute(
+            'INSERT INTO projects'
+            ' (name, dir, pypi, repository, build_for_windows, script)'
+            ' VALUES (?, ?, ?, ?, ?, ?)'
+            ' ON CONFLICT (name) DO UPDATE SET'
+            ' dir = excluded.dir, pypi = excluded.pypi,'
+            ' repository = excluded.repository,'
+            ' build_for_windows = excluded.build_for_windows,'
+            ' script = excluded.script',
+            (
+                name,
+                item['dir'],
+                bool(item['pypi']),
+                item.get('repository') or '',
+                bool(item.get('build_for_windows')),
+                item.get('script') or '',
+            ))
+        connection.executemany(
+            'INSERT INTO environments'
+            ' (project, environment, dir, python_version)'
+            ' VALUES (?, ?, ?, ?)',
+            [(name, environment, data[1], data[2])
+             for environment, data in item['cached_envs'].items()])
+
+    def read_metadata(self) -> dict[str, dict]:
+        """Return the snapshot entries keyed on project name."""
+        with closing(self._connect()) as connection:
+            return {
+                project: {'key': json.loads(key),
+                          'values': json.loads(values)}
+                for project, key, values in connection.execute(
+                    'SELECT project, key, project_values FROM metadata')
+            }
+
+    def write_metadata(self, entries: dict[str, dict | None]) -> int:
+        """Write the snapshot entries; None removes a project's entry."""
+        try:
+            with closing(self._connect()) as connection, connection:
+                for project, entry in entries.items():
+                    if entry is None:
+                        connection.execute(
+                            'DELETE FROM metadata WHERE project = ?',
+                            (project,))
+                        continue
+                    connection.execute(
+                        'INSERT OR REPLACE INTO metadata'
+                        ' (project, key, project_values) VALUES (?, ?, ?)',
+                        (project,
+                         json.dumps(entry['key']),
+                         json.dumps(entry['values'])))
+            return Status.OK
+        except sqlite3.Error as error:
+            logger.warning(
+                "Project metadata not saved",
+                path=str(self.path),
+                error=str(error),
+            )
+            return Status.ERROR
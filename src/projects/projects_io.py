@@ -1,4 +1,5 @@
 """I/O operations for projects.py."""
+import os
 from pathlib import Path
 import json
 
@@ -65,7 +66,11 @@ def read_json_file(path: str) -> dict:
         with open(path, 'r', encoding='utf8') as f_json:
             try:
                 return json.load(f_json)
-            except json.decoder.JSONDecodeError:
+            except json.decoder.JSONDecodeError as error:
+                logger.warning(
+                    f'Invalid JSON in {path}',
+                    error=str(error),
+                )
                 return {}
     except FileNotFoundError:
         logger.warning(f'File not found {path}')
@@ -76,19 +81,31 @@ def update_json_file(path: str, output: dict) -> int:
     """
     Update the JSON file with the provided output.
 
+    The data is written to a temporary file which is then renamed over
+    the original, so the file is never left partly written.
+
     Args:
         path (str): The path to the JSON file to be updated.
         output (dict): The JSON data to write to the file.
 
     Returns:
-        int: The number of characters written to the file,
-        or Status.ERROR if the file is not found.
+        int: The status of the update operation (Status.OK
+        or Status.ERROR).
     """
-
+    path = Path(path)
+    temp_path = path.with_name(f'{path.name}.tmp')
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, 'w', encoding='utf8') as f_json:
-            return json.dump(output, f_json)
-    except NotADirectoryError:
-        logger.warning(f'Cannot find directory: {Path(path).parent}')
-        return {}
+        with open(temp_path, 'w', encoding='utf8') as f_json:
+            json.dump(output, f_json)
+            f_json.flush()
+            os.fsync(f_json.fileno())
+        os.replace(temp_path, path)
+        return Status.OK
+    except (NotADirectoryError, FileExistsError):
+        logger.warning(f'Cannot find directory: {path.parent}')
+        return Status.ERROR
+    except (OSError, TypeError, ValueError) as error:
+        logger.warning(f'Cannot write {path}', error=str(error))
+        temp_path.unlink(missing_ok=True)
+        return Status.ERROR
@@ -0,0 +1,86 @@
+"""
+    record
+    ======
+
+    Read the file hashes recorded for an installed distribution.
+
+    A wheel installs a RECORD file in its *.dist-info directory listing
+    each installed file with its sha256 and size:
+
+        projects/compare.py,sha256=<urlsafe base64, no padding>,1234
+
+    The hashes let an environment be checked against a source tree
+    without reading the environment's files. An editable install is
+    marked in direct_url.json and its RECORD lists no package files, so
+    it has no usable entries.
+"""
+import base64
+import csv
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+from projects.version_resolver import find_dist_info
+
+RECORD_FILE = 'RECORD'
+DIRECT_URL_FILE = 'direct_url.json'
+HASH_ALGORITHM = 'sha256'
+
+
+class RecordEntry(NamedTuple):
+    digest: str
+    size: int
+
+
+def record_digest(hexdigest: str) -> str:
+    """Return a hex sha256 in the encoding used by RECORD."""
+    digest = base64.urlsafe_b64encode(bytes.fromhex(hexdigest))
+    return digest.rstrip(b'=').decode('ascii')
+
+
+def is_editable(dist_info: Path) -> bool:
+    """Return True if the distribution is an editable install."""
+    try:
+        with open(Path(dist_info, DIRECT_URL_FILE), 'r',
+                  encoding='utf8') as f_direct_url:
+            direct_url = json.load(f_direct_url)
+    except (FileNotFoundError, ValueError):
+        return False
+    return bool(direct_url.get('dir_info', {}).get('editable'))
+
+
+def read_record(dist_info: Path, package: str) -> dict[str, RecordEntry]:
+    """Return the package's entries keyed on their path in the package."""
+    prefix = f'{package}/'
+    entries = {}
+    try:
+        with open(Path(dist_info, RECORD_FILE), 'r',
+                  encoding='utf8', newline='') as f_record:
+            for row in csv.reader(f_record):
+                if len(row) < 3 or not row[0].startswith(prefix):
+                    continue
+                algorithm, _, digest = row[1].partition('=')
+                if algorithm != HASH_ALGORITHM or not row[2].isdigit():
+                    continue
+                entries[row[0][len(prefix):]] = RecordEntry(
+                    digest, int(row[2]))
+    except FileNotFoundError:
+        return {}
+    return entries
+
+
+def package_record(package_dir: str) -> dict[str, RecordEntry]:
+    """Return the RECORD entries for an installed package directory.
+
+    The result is empty if the package has no dist-info or RECORD, or is
+    an editable install.
+    """
+    site_packages, name = os.path.split(os.path.normpath(package_dir))
+    dist_info = find_dist_info(site_packages, name)
+    if not dist_info:
+        return {}
+    path = Path(site_packages, dist_info)
+    if is_editable(path):
+        return {}
+    return read_record(path, name)
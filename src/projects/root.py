@@ -1,18 +1,18 @@
 import sys
 import tkinter as tk
 import contextlib
+from collections.abc import Callable
 
 from psiutils.widgets import get_styles
 
 
 from projects.constants import ICON_FILE
-from projects.forms.frm_main import MainFrame
-from projects.module_caller import ModuleCaller
 
 
 class Root():
-    def __init__(self) -> None:
+    def __init__(self, on_idle: Callable = None) -> None:
         self.root = tk.Tk()
+        self.on_idle = on_idle
 
         self.show()
 
@@ -26,12 +26,20 @@ class Root():
 
         get_styles()
 
+        # The forms are imported here so that they are not loaded at
+        # import time
         dlg = None
         if len(sys.argv) > 1:
+            from projects.module_caller import ModuleCaller
             module = sys.argv[1]
             dlg = ModuleCaller(root, module)
 
         if not dlg or dlg.invalid:
+            from projects.forms.frm_main import MainFrame
             MainFrame(self)
 
+        # Run once the first frame has been drawn
+        if self.on_idle:
+            root.after_idle(self.on_idle)
+
         root.mainloop()
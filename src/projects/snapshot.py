@@ -0,0 +1,83 @@
+"""
+    snapshot
+    ========
+
+    A cache of the values that each Project derives from its files.
+
+    Each project's entry is stored with a key made from the
+    (mtime_ns, size) of the files the values were read from. On the next
+    launch the key is rebuilt with stat calls alone and, if it matches,
+    the values are used without opening the files.
+
+    The snapshot is kept in a JSON file, or in the metadata table of the
+    project store when the store has one.
+"""
+import threading
+from pathlib import Path
+
+import projects.projects_io as io
+
+
+class ProjectSnapshot():
+    """Derived project values keyed on the stat of their source files."""
+
+    def __init__(self, path: Path = None, store: object = None) -> None:
+        self.path = path
+        self.store = store
+        self.entries: dict[str, dict] = {}
+        self.dirty = False
+        self._changed: set[str] = set()
+        self._lock = threading.Lock()
+
+        if store:
+            self.entries = store.read_metadata()
+        elif path:
+            self.entries = io.read_json_file(path)
+
+    def get(self, name: str, key: list) -> dict | None:
+        """Return the values stored for the project if the key matches."""
+        with self._lock:
+            entry = self.entries.get(name)
+        if not entry or entry['key'] != key:
+            return None
+        return entry['values']
+
+    def put(self, name: str, key: list, values: dict) -> None:
+        """Store the values derived for the project."""
+        with self._lock:
+            self.entries[name] = {'key': key, 'values': values}
+            self._changed.add(name)
+            self.dirty = True
+
+    def discard(self, name: str) -> None:
+        """Remove the project's entry."""
+        with self._lock:
+            if self.entries.pop(name, None):
+                self._changed.add(name)
+                self.dirty = True
+
+    def save(self) -> None:
+        """Write the snapshot if it has changed."""
+        if not (self.dirty and (self.path or self.store)):
+            return
+        with self._lock:
+            if self.store:
+                self.store.write_metadata(
+                    {name: self.entries.get(name) for name in self._changed})
+            else:
+                io.update_json_file(self.path, self.entries)
+            self._changed.clear()
+            self.dirty = False
+
+
+def stat_key(*paths: Path) -> list:
+    """Return the (mtime_ns, size) of each path, None if it is missing."""
+    key = []
+    for path in paths:
+        try:
+            stat = Path(path).stat()
+        except (FileNotFoundError, NotADirectoryError):
+            key.append(None)
+            continue
+        key.append([stat.st_mtime_ns, stat.st_size])
+    return key
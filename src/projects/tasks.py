@@ -0,0 +1,189 @@
+"""
+    tasks
+    =====
+
+    Run slow jobs on worker threads and deliver their results to Tk.
+
+    A TaskRunner belongs to a window. Jobs submitted to it run on a
+    thread pool and never touch Tk; their results, errors and progress
+    reports are put on a queue that the runner drains on the Tk thread,
+    through root.after polling, and passed to the callbacks given when
+    the job was submitted.
+
+    A job that reports progress, or that stops early when cancelled, is
+    submitted with pass_task=True and receives its Task as the keyword
+    argument task.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Callable
+
+from projects import logger
+
+# Milliseconds between checks for finished jobs
+POLL_INTERVAL = 50
+
+DONE = 'done'
+PROGRESS = 'progress'
+
+
+class Task():
+    """A job submitted to a TaskRunner."""
+
+    def __init__(
+            self,
+            name: str,
+            on_done: Callable = None,
+            on_error: Callable = None,
+            on_progress: Callable = None,
+            results: queue.SimpleQueue = None) -> None:
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.future: Future = None
+        self.started = 0.0
+        self.finished = 0.0
+        self._cancelled = threading.Event()
+        self._results = results
+
+    def __repr__(self) -> str:
+        return f'Task: {self.name}'
+
+    @property
+    def cancelled(self) -> bool:
+        """Return True once the task has been cancelled."""
+        return self._cancelled.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        """Return the seconds the job has run for."""
+        if not self.started:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    def cancel(self) -> None:
+        """Cancel the task; its callbacks will not be called."""
+        self._cancelled.set()
+        if self.future:
+            self.future.cancel()
+
+    def report(self, progress: object) -> None:
+        """Report progress from the job; call from the worker thread."""
+        if self.on_progress and not self.cancelled:
+            self._results.put((PROGRESS, self, progress))
+
+
+class TaskRunner():
+    """Run jobs on worker threads and call back on the Tk thread."""
+
+    def __init__(
+            self,
+            root: object,
+            workers: int = 1,
+            poll_interval: int = POLL_INTERVAL) -> None:
+        self.root = root
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self.tasks: list[Task] = []
+        self._queue = queue.SimpleQueue()
+        self._poll_id = None
+        self._closed = False
+
+    def submit(
+            self,
+            function: Callable,
+            *args,
+            name: str = '',
+            on_done: Callable = None,
+            on_error: Callable = None,
+            on_progress: Callable = None,
+            pass_task: bool = False,
+            **kwargs) -> Task:
+        """Run function(*args, **kwargs) on a worker thread.
+
+        on_done is called with the result, or on_error with the exception
+        raised, and on_progress with each value the job reports.
+        """
+        task = Task(
+            name or function.__name__,
+            on_done, on_error, on_progress, self._queue)
+        if pass_task:
+            kwargs['task'] = task
+
+        def run() -> object:
+            task.started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                task.finished = time.perf_counter()
+
+        task.future = self.executor.submit(run)
+        task.future.add_done_callback(
+            lambda future: self._queue.put((DONE, task, None)))
+        self.tasks.append(task)
+        if not self._poll_id:
+            self._poll_id = self.root.after(self.poll_interval, self._poll)
+        return task
+
+    def cancel_all(self) -> None:
+        """Cancel every task that has not finished."""
+        for task in self.tasks:
+            task.cancel()
+
+    def shutdown(self) -> None:
+        """Cancel the tasks and stop polling; call when the window closes."""
+        self._closed = True
+        self.cancel_all()
+        if self._poll_id:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self) -> None:
+        self._poll_id = None
+        while True:
+            try:
+                kind, task, value = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == PROGRESS:
+                if not task.cancelled:
+                    task.on_progress(value)
+                continue
+            self.tasks.remove(task)
+            self._finish(task)
+            if self._closed:
+                # A callback closed the window
+                return
+
+        if self.tasks and not self._poll_id:
+            self._poll_id = self.root.after(self.poll_interval, self._poll)
+
+    @staticmethod
+    def _finish(task: Task) -> None:
+        if task.cancelled:
+            return
+        try:
+            result = task.future.result()
+        except CancelledError:
+            return
+        except Exception as error:  # pylint: disable=broad-except
+            logger.warning(
+                "Task failed",
+                task=task.name,
+                error=str(error),
+                elapsed=round(task.elapsed, 3),
+            )
+            if task.on_error:
+                task.on_error(error)
+            return
+        logger.debug(
+            "Task finished",
+            task=task.name,
+            elapsed=round(task.elapsed, 3),
+        )
+        if task.on_done:
+            task.on_done(result)
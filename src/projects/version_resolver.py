@@ -0,0 +1,104 @@
+"""
+    version_resolver
+    ================
+
+    Resolve the version of a package installed in a site-packages directory.
+
+    The version is taken, in order of preference, from:
+
+    - the name of the distribution's *.dist-info directory
+      (e.g. projects-1.2.3.dist-info), which needs no file to be opened;
+    - the Version header in the dist-info METADATA file;
+    - the package's own _version.py file.
+"""
+import os
+import re
+from pathlib import Path
+
+from projects.constants import VERSION_FILE, VERSION_TEXT
+
+DIST_INFO = '.dist-info'
+METADATA_FILE = 'METADATA'
+
+NO_VERSION_FILE = 'No version file'
+VERSION_ERROR = 'Version error'
+
+VERSION_RE = re.compile(
+    rf'^{VERSION_TEXT}\s*=\s*[\'"]([^\'"]+)[\'"]', re.MULTILINE)
+
+
+def resolve_version(package_dir: str) -> str:
+    """Return the installed version of the package in package_dir."""
+    return resolve(package_dir)[0]
+
+
+def resolve(package_dir: str) -> tuple[str, Path]:
+    """Return the installed version and the path it was read from."""
+    site_packages, name = os.path.split(package_dir)
+    if dist_info := find_dist_info(site_packages, name):
+        path = Path(site_packages, dist_info)
+        version = dist_info_version(dist_info)
+        if not version:
+            version = metadata_version(Path(path, METADATA_FILE))
+        if version:
+            return version, path
+    path = Path(package_dir, VERSION_FILE)
+    return version_file_version(path), path
+
+
+def normalise_name(name: str) -> str:
+    """Return the name normalised for comparison (PEP 503)."""
+    return re.sub(r'[-_.]+', '_', name).lower()
+
+
+def find_dist_info(
+        site_packages: str, name: str, entries: list[str] = None) -> str:
+    """Return the name of the dist-info directory for the distribution."""
+    if entries is None:
+        try:
+            entries = os.listdir(site_packages)
+        except (FileNotFoundError, NotADirectoryError):
+            return ''
+
+    normalised_name = normalise_name(name)
+    for entry in entries:
+        if not entry.endswith(DIST_INFO):
+            continue
+        dist_name = entry[:-len(DIST_INFO)].rpartition('-')[0]
+        if normalise_name(dist_name) == normalised_name:
+            return entry
+    return ''
+
+
+def dist_info_version(dist_info: str) -> str:
+    """Return the version encoded in a dist-info directory name."""
+    dist_name, _, version = dist_info[:-len(DIST_INFO)].rpartition('-')
+    return version if dist_name else ''
+
+
+def metadata_version(path: Path) -> str:
+    """Return the Version header of a METADATA file."""
+    try:
+        with open(path, 'r', encoding='utf8') as f_metadata:
+            for line in f_metadata:
+                if not line.strip():
+                    # The headers end at the first blank line
+                    break
+                key, _, value = line.partition(':')
+                if key == 'Version':
+                    return value.strip()
+    except FileNotFoundError:
+        pass
+    return ''
+
+
+def version_file_version(path: Path) -> str:
+    """Return the version assigned in a _version.py file."""
+    try:
+        with open(path, 'r', encoding='utf8') as f_version:
+            text = f_version.read()
+    except FileNotFoundError:
+        return NO_VERSION_FILE
+    if match := VERSION_RE.search(text):
+        return match.group(1)
+    return VERSION_ERROR
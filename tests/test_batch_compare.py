@@ -0,0 +1,100 @@
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+import projects.batch_compare as batch_compare
+import projects.hash_cache as hash_cache_module
+import projects.project_server as project_server
+from projects.hash_cache import HashCache
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch) -> Path:
+    monkeypatch.setattr(hash_cache_module, '_hash_cache', HashCache())
+    monkeypatch.setattr(project_server, '_project_server', None)
+    monkeypatch.setattr(project_server, 'DATA_DIR', str(tmp_path))
+
+    source = Path(tmp_path, 'src', 'alpha')
+    source.mkdir(parents=True)
+    Path(source, 'main.py').write_text('main')
+    Path(source, 'extra.py').write_text('extra')
+    cached_envs = {}
+    for name, text in (('same', 'main'), ('old', 'old')):
+        env = Path(tmp_path, name, 'site-packages', 'alpha')
+        env.mkdir(parents=True)
+        Path(env, 'main.py').write_text(text)
+        Path(env, 'extra.py').write_text('extra')
+        cached_envs[name] = [name, str(env), '3.12']
+
+    project_file = Path(tmp_path, project_server.config.project_file)
+    project_file.write_text(json.dumps({
+        'alpha': {
+            'dir': str(source),
+            'pypi': False,
+            'build_for_windows': False,
+            'cached_envs': cached_envs,
+        },
+    }))
+    return tmp_path
+
+
+def test_json_output_and_exit_code(workspace, capsys):
+    code = batch_compare.main(['--all', '--json', '--workers', '2'])
+    assert code == batch_compare.EXIT_DIFFERENT
+
+    output = json.loads(capsys.readouterr().out)
+    results = {item['env']: item for item in output}
+    assert results['same']['status'] == 'ok'
+    assert results['old']['status'] == 'different'
+    assert results['old']['mismatches'] == ['main.py']
+    assert results['old']['only_in_env'] == []
+
+
+def test_table_output(workspace, capsys):
+    code = batch_compare.main(['alpha', '--mode', 'shallow'])
+    lines = capsys.readouterr().out.splitlines()
+    # Columns are separated by at least two spaces
+    headings, *rows = [re.split(r'\s{2,}', line) for line in lines]
+    assert headings == [
+        'Project', 'Environment', 'Version', 'Status', 'Missing',
+        'May differ', 'Mismatched']
+    rows = {row[1]: row for row in rows}
+    assert len(rows) == 2
+    # The files were written after the source's, so none can be decided
+    # by mtime, but only a confirmed difference counts
+    assert rows['same'][3:] == ['ok', '0', '2']
+    assert rows['old'][3:] == ['different', '0', '1', 'main.py']
+    assert code == batch_compare.EXIT_DIFFERENT
+
+
+def test_shallow_undecided_files_are_not_drift(workspace, capsys):
+    code = batch_compare.main(['--all', '--json', '--mode', 'shallow'])
+    output = json.loads(capsys.readouterr().out)
+    same, = [item for item in output if item['env'] == 'same']
+    assert same['status'] == 'ok'
+    assert same['mismatches'] == []
+    assert sorted(same['may_differ']) == ['extra.py', 'main.py']
+    assert code == batch_compare.EXIT_DIFFERENT
+
+
+def test_unknown_project(workspace):
+    assert batch_compare.main(['beta']) == batch_compare.EXIT_ERROR
+
+
+def test_no_projects_is_an_error(workspace):
+    Path(workspace, project_server.config.project_file).unlink()
+    assert batch_compare.main(['--all']) == batch_compare.EXIT_ERROR
+
+
+def test_exit_code_prefers_errors():
+    results = [
+        batch_compare.PairResult(
+            'a', 'e', '1', '/e', [], [], ['x.py'], [], ''),
+        batch_compare.PairResult(
+            'a', 'f', '1', '/f', [], [], [], [], 'failed'),
+    ]
+    assert batch_compare.exit_code(results) == batch_compare.EXIT_ERROR
+    assert batch_compare.exit_code(results[:1]) == batch_compare.EXIT_DIFFERENT
+    assert batch_compare.exit_code([]) == batch_compare.EXIT_OK
@@ -0,0 +1,238 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import projects.compare as compare_module
+import projects.hash_cache as hash_cache_module
+from projects.compare import DEEP, RECORD, SHALLOW, TreeHasher, compare
+from projects.file_compare import file_hash
+from projects.record import record_digest
+from projects.hash_cache import HashCache
+
+
+@pytest.fixture(autouse=True)
+def hash_cache(monkeypatch) -> HashCache:
+    cache = HashCache()
+    monkeypatch.setattr(hash_cache_module, '_hash_cache', cache)
+    return cache
+
+
+def _tree(root: Path, files: dict[str, str]) -> Path:
+    for name, text in files.items():
+        path = Path(root, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return root
+
+
+def test_nested_mismatches_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(compare_module.config, 'ignore', ['__pycache__'])
+    files = {
+        'main.py': 'main',
+        'forms/frm_main.py': 'form',
+        'forms/widgets/button.py': 'button',
+        'data/a.txt': 'a',
+    }
+    source = _tree(Path(tmp_path, 'source'), files)
+    env = _tree(Path(tmp_path, 'env'), {
+        **files,
+        'forms/widgets/button.py': 'changed',
+        'forms/extra.py': 'extra',
+        'forms/__pycache__/frm_main.pyc': 'ignored',
+    })
+
+    missing, mismatches = compare(source, env)
+    assert mismatches == ['forms/widgets/button.py']
+    # Files that are only in the env are listed first
+    assert missing == [('forms/extra.py', '')]
+
+
+def test_identical_subtree_skipped(tmp_path, monkeypatch):
+    files = {'pkg/a.py': 'a', 'pkg/sub/b.py': 'b'}
+    source = _tree(Path(tmp_path, 'source'), files)
+    env = _tree(Path(tmp_path, 'env'), files)
+    calls = []
+    original = compare_module._compare_dirs
+
+    def counting(*args):
+        calls.append(args[2])
+        return original(*args)
+
+    monkeypatch.setattr(compare_module, '_compare_dirs', counting)
+    assert compare(source, env) == ([], [])
+    assert calls == ['']
+
+
+def test_tree_hash_depends_on_contents(tmp_path):
+    hasher = TreeHasher()
+    dir_0 = _tree(Path(tmp_path, 'a'), {'x.py': '1', 'y.py': '2'})
+    dir_1 = _tree(Path(tmp_path, 'b'), {'x.py': '1', 'y.py': '3'})
+    assert hasher.tree_hash(dir_0) != hasher.tree_hash(dir_1)
+
+
+def test_unchanged_files_hashed_once(tmp_path, hash_cache):
+    files = {'pkg/a.py': 'a', 'pkg/sub/b.py': 'b'}
+    source = _tree(Path(tmp_path, 'source'), files)
+    env_0 = _tree(Path(tmp_path, 'env_0'), files)
+    env_1 = _tree(Path(tmp_path, 'env_1'), {**files, 'pkg/a.py': 'x'})
+
+    compare(source, env_0)
+    assert hash_cache.misses == 4
+    assert compare(source, env_1) == ([], ['pkg/a.py'])
+    # Only env_1's files are new
+    assert hash_cache.misses == 6
+
+    Path(source, 'pkg/a.py').write_text('changed')
+    assert compare(source, env_0, hash_cache) == ([], ['pkg/a.py'])
+    assert hash_cache.misses == 7
+
+
+def test_top_level_files_hashed_once(tmp_path, hash_cache, monkeypatch):
+    files = {'top.py': 'top', 'sub/inner.py': 'inner'}
+    source = _tree(Path(tmp_path, 'src'), files)
+    env_0 = _tree(Path(tmp_path, 'env_0'), files)
+    env_1 = _tree(Path(tmp_path, 'env_1'), {**files, 'top.py': 'new'})
+    hashed = []
+    original = hash_cache_module.file_hash
+
+    def counting_hash(path):
+        hashed.append(Path(path))
+        return original(path)
+
+    monkeypatch.setattr(hash_cache_module, 'file_hash', counting_hash)
+    assert compare(source, env_0) == ([], [])
+    assert compare(source, env_1) == ([], ['top.py'])
+    assert hashed.count(Path(source, 'top.py')) == 1
+    assert hashed.count(Path(source, 'sub/inner.py')) == 1
+    assert str(Path(source, 'top.py')) in hash_cache.entries
+
+
+def test_hash_cache_persists_and_evicts(tmp_path):
+    paths = []
+    for index in range(3):
+        path = Path(tmp_path, f'{index}.txt')
+        path.write_text(str(index))
+        paths.append(path)
+    cache_path = Path(tmp_path, 'hash_cache.json')
+    cache = HashCache(cache_path, max_entries=2)
+    for path in paths:
+        cache.file_hash(path)
+    cache.file_hash(paths[1])
+    cache.save()
+
+    cache = HashCache(cache_path, max_entries=2)
+    assert list(cache.entries) == [str(paths[2]), str(paths[1])]
+    cache.file_hash(paths[1])
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def _set_mtime(path: Path, mtime_ns: int) -> None:
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_shallow_compare_uses_size_and_mtime(tmp_path, monkeypatch):
+    source = _tree(Path(tmp_path, 'source'), {
+        'same.py': 'aaa', 'touched.py': 'bbb', 'sized.py': 'ccc'})
+    env = _tree(Path(tmp_path, 'env'), {
+        'same.py': 'xxx', 'touched.py': 'bbb', 'sized.py': 'cccc'})
+    for name in ('same.py', 'sized.py'):
+        _set_mtime(Path(source, name), 10**18)
+        _set_mtime(Path(env, name), 10**18)
+    _set_mtime(Path(source, 'touched.py'), 10**18)
+    _set_mtime(Path(env, 'touched.py'), 2 * 10**18)
+
+    def no_open(*args, **kwargs):
+        raise AssertionError('file opened')
+
+    monkeypatch.setattr(compare_module, 'same_contents', no_open)
+    monkeypatch.setattr('projects.hash_cache.file_hash', no_open)
+    missing, mismatches = compare(source, env, mode=SHALLOW)
+    assert not missing
+    # Same size and mtime is taken on trust; a new mtime might differ
+    assert sorted(mismatches) == ['sized.py', 'touched.py']
+
+
+def test_shallow_compare_separates_undecided(tmp_path):
+    source = _tree(Path(tmp_path, 'source'), {'a.py': 'a', 'b.py': 'b'})
+    env = _tree(Path(tmp_path, 'env'), {'a.py': 'a', 'b.py': 'bb'})
+    _set_mtime(Path(env, 'a.py'), 10**18)
+    undecided = []
+    missing, mismatches = compare(
+        source, env, mode=SHALLOW, undecided=undecided)
+    assert (missing, mismatches, undecided) == ([], ['b.py'], ['a.py'])
+
+
+def test_shallow_compare_uses_cached_hashes(tmp_path):
+    files = {'pkg/a.py': 'a', 'pkg/b.py': 'b'}
+    source = _tree(Path(tmp_path, 'source'), files)
+    env = _tree(Path(tmp_path, 'env'), files)
+    _set_mtime(Path(env, 'pkg/a.py'), 10**18)
+    _set_mtime(Path(env, 'pkg/b.py'), 10**18)
+    mismatches = compare(source, env, mode=SHALLOW)[1]
+    assert sorted(mismatches) == ['pkg/a.py', 'pkg/b.py']
+
+    assert compare(source, env, mode=DEEP) == ([], [])
+    assert compare(source, env, mode=SHALLOW) == ([], [])
+
+
+def test_deep_compare_decides_later_shallow_compares(tmp_path):
+    files = {'top.py': 'top', '_version.py': 'v'}
+    source = _tree(Path(tmp_path, 'source'), files)
+    env = _tree(Path(tmp_path, 'env'), files)
+    for name in files:
+        _set_mtime(Path(env, name), 10**18)
+    assert compare(source, env, mode=DEEP) == ([], [])
+
+    undecided = []
+    assert compare(
+        source, env, mode=SHALLOW, undecided=undecided) == ([], [])
+    assert undecided == []
+
+
+def test_invalid_mode(tmp_path):
+    with pytest.raises(ValueError):
+        compare(tmp_path, tmp_path, mode='quick')
+
+
+def _install(tmp_path: Path, files: dict[str, str], editable=False) -> Path:
+    site_packages = Path(tmp_path, 'site-packages')
+    env = _tree(Path(site_packages, 'pkg'), files)
+    dist_info = Path(site_packages, 'pkg-1.0.dist-info')
+    dist_info.mkdir()
+    lines = [
+        f'pkg/{name},sha256={record_digest(file_hash(Path(env, name)))},'
+        f'{Path(env, name).stat().st_size}'
+        for name in files
+    ]
+    lines.append('pkg-1.0.dist-info/RECORD,,')
+    Path(dist_info, 'RECORD').write_text('\n'.join(lines) + '\n')
+    if editable:
+        Path(dist_info, 'direct_url.json').write_text(
+            '{"url": "file:///src", "dir_info": {"editable": true}}')
+    return env
+
+
+def test_record_compare_reads_only_source(tmp_path, hash_cache):
+    files = {'a.py': 'a', 'sub/b.py': 'b', 'sub/c.py': 'c'}
+    source = _tree(Path(tmp_path, 'source'), {
+        **files, 'sub/b.py': 'changed', 'new.py': 'new'})
+    env = _install(tmp_path, files)
+    # A same-sized edit to the env is not seen: its files are not read
+    Path(env, 'a.py').write_text('x')
+
+    missing, mismatches = compare(source, env, mode=RECORD)
+    assert missing == [('', 'new.py')]
+    assert mismatches == ['sub/b.py']
+    assert all(key.startswith(str(source)) for key in hash_cache.entries)
+
+    Path(env, 'sub/c.py').write_text('cc')
+    assert compare(source, env, mode=RECORD)[1] == ['sub/b.py', 'sub/c.py']
+
+
+def test_record_compare_falls_back_to_deep(tmp_path):
+    source = _tree(Path(tmp_path, 'source'), {'a.py': 'b'})
+    env = _install(tmp_path, {'a.py': 'a'}, editable=True)
+    # RECORD would report a.py; the contents are the same
+    Path(env, 'a.py').write_text('b')
+    assert compare(source, env, mode=RECORD) == ([], [])
@@ -0,0 +1,66 @@
+import atexit
+from pathlib import Path
+
+from psiconfig import TomlConfig
+
+from projects.config import DEFAULT_CONFIG, DeferredConfig
+from projects.forms.frm_config import ConfigFrame
+
+
+def test_saves_are_coalesced(tmp_path):
+    path = Path(tmp_path, 'config.toml')
+    config = DeferredConfig(
+        TomlConfig(path=path, defaults=DEFAULT_CONFIG), delay=60)
+    atexit.unregister(config.close)
+    for name in ('alpha', 'beta', 'gamma'):
+        config.update('last_project', name)
+        config.save()
+    assert config.last_project == 'gamma'
+    assert not path.exists()
+
+    config.read()
+    assert config.last_project == 'gamma'
+
+    config.flush()
+    assert TomlConfig(path=path).last_project == 'gamma'
+    assert (config.requested, config.written) == (3, 1)
+    assert config.saved_writes == 2
+
+    config.flush()
+    assert config.written == 1
+
+
+class Value():
+    """Stands in for a tk variable or Text widget."""
+
+    def __init__(self, value: str) -> None:
+        self.value = value
+
+    def get(self, *args) -> str:
+        return self.value
+
+
+class Window():
+    def destroy(self) -> None:
+        pass
+
+
+def test_config_form_save_is_written(tmp_path):
+    path = Path(tmp_path, 'config.toml')
+    TomlConfig(path=path, defaults=DEFAULT_CONFIG).save()
+    config = DeferredConfig(
+        TomlConfig(path=path, defaults=DEFAULT_CONFIG), delay=60)
+    atexit.unregister(config.close)
+
+    # The form without its widgets
+    form = ConfigFrame.__new__(ConfigFrame)
+    form.config = config
+    form.root = Window()
+    form.data_directory = Value(config.data_directory)
+    form.script_directory = Value('/scripts')
+    form.ignore_text = Value('__pycache__\n')
+    assert form._save_config() == config.STATUS_OK
+
+    saved = TomlConfig(path=path)
+    assert saved.script_directory == '/scripts'
+    assert saved.ignore == ['__pycache__']
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import pytest
+
+from projects.env_index import EnvironmentIndex
+from projects.env_discovery import discover
+
+
+def _make_package(site_packages: Path, name: str, version: str) -> None:
+    package_dir = Path(site_packages, name)
+    Path(package_dir, 'sub', '__pycache__').mkdir(parents=True)
+    Path(package_dir, '_version.py').write_text(f"__version__ = '{version}'")
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    pyenv_dir = Path(tmp_path, '.pyenv', 'versions')
+    venv_root = Path(tmp_path, 'projects')
+
+    site_packages = Path(
+        pyenv_dir, '3.11.7', 'lib', 'python3.11', 'site-packages')
+    _make_package(site_packages, 'alpha', '1.0.0')
+    _make_package(site_packages, 'beta', '2.0.0')
+
+    site_packages = Path(
+        venv_root, 'utilities', 'gamma', '.venv',
+        'lib', 'python3.12', 'site-packages')
+    _make_package(site_packages, 'alpha', '1.0.1')
+    Path(venv_root, 'utilities', 'gamma', 'src', 'gamma').mkdir(parents=True)
+
+    return pyenv_dir, venv_root
+
+
+def test_index_maps_packages_to_environments(workspace):
+    index = EnvironmentIndex(*workspace)
+    index.scan()
+
+    alpha = index.versions('alpha')
+    assert sorted(alpha) == ['3.11.7', 'gamma']
+    assert alpha['3.11.7'].python_version == 'python3.11'
+    assert alpha['gamma'].version == '1.0.1'
+    assert list(index.versions('beta')) == ['3.11.7']
+    assert index.versions('missing') == {}
+
+
+def test_versions_scans_on_first_use(workspace):
+    index = EnvironmentIndex(*workspace)
+    assert not index.scanned
+    assert list(index.versions('beta')) == ['3.11.7']
+    assert index.scanned
+
+
+def test_discovery_is_bounded_by_environments(workspace):
+    pyenv_dir, venv_root = workspace
+    discovery = discover(pyenv_dir, venv_root)
+
+    assert sorted(item.environment for item in discovery.site_packages) == [
+        '3.11.7', 'gamma']
+    # pyenv: versions, 3.11.7/lib
+    # venv: projects, utilities, gamma, .venv/lib
+    assert discovery.visited == 6
+
+
+def test_scan_does_not_enter_packages(workspace):
+    index = EnvironmentIndex(*workspace)
+    index.scan()
+    # discovery plus one listing per site-packages directory
+    assert index.visited == 8
+
+
+def test_persistent_index_rescans_only_changed_sites(workspace, tmp_path):
+    pyenv_dir, venv_root = workspace
+    cache_path = Path(tmp_path, 'data', 'env_index.json')
+
+    index = EnvironmentIndex(pyenv_dir, venv_root, cache_path)
+    index.scan()
+    assert index.rescanned == 2
+    assert cache_path.is_file()
+
+    index = EnvironmentIndex(pyenv_dir, venv_root, cache_path)
+    index.scan()
+    assert index.rescanned == 0
+    assert sorted(index.versions('alpha')) == ['3.11.7', 'gamma']
+
+    site_packages = Path(
+        venv_root, 'delta', '.venv', 'lib', 'python3.12', 'site-packages')
+    _make_package(site_packages, 'alpha', '1.0.2')
+    index.scan()
+    assert index.rescanned == 1
+    assert sorted(index.versions('alpha')) == ['3.11.7', 'delta', 'gamma']
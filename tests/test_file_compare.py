@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import projects.file_compare as file_compare
+from projects.file_compare import same_contents
+
+
+def _write(path: Path, data: bytes) -> Path:
+    path.write_bytes(data)
+    return path
+
+
+def test_same_contents_binary(tmp_path):
+    data = bytes(range(256)) * 1000
+    path_0 = _write(Path(tmp_path, 'a.so'), data)
+    path_1 = _write(Path(tmp_path, 'b.so'), data)
+    path_2 = _write(Path(tmp_path, 'c.so'), data[:-1] + b'\x00')
+    path_3 = _write(Path(tmp_path, 'd.so'), data[:-1])
+    assert same_contents(path_0, path_1, chunk_size=1024)
+    assert not same_contents(path_0, path_2, chunk_size=1024)
+    assert not same_contents(path_0, path_3)
+
+
+def test_difference_found_in_first_block(tmp_path, monkeypatch):
+    size = 4 * 1024 * 1024
+    path_0 = _write(Path(tmp_path, 'a.bin'), b'a' + bytes(size - 1))
+    path_1 = _write(Path(tmp_path, 'b.bin'), b'b' + bytes(size - 1))
+    reads = []
+
+    def counting_chunks(f_0, f_1, chunk_size):
+        original_read = f_0.read
+
+        def read(size):
+            reads.append(size)
+            return original_read(size)
+        f_0.read = read
+        return same_chunks(f_0, f_1, chunk_size)
+
+    same_chunks = file_compare._same_chunks
+    monkeypatch.setattr(file_compare, '_same_chunks', counting_chunks)
+    assert not same_contents(path_0, path_1)
+    assert len(reads) == 1
+
+
+def test_large_files_are_mapped(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_compare, 'MMAP_THRESHOLD', 1024)
+    data = b'x' * 10_000
+    path_0 = _write(Path(tmp_path, 'a.bin'), data)
+    path_1 = _write(Path(tmp_path, 'b.bin'), data)
+    path_2 = _write(Path(tmp_path, 'c.bin'), data[:-1] + b'y')
+    assert same_contents(path_0, path_1, chunk_size=4096)
+    assert not same_contents(path_0, path_2, chunk_size=4096)
@@ -0,0 +1,47 @@
+from datetime import datetime
+from pathlib import Path
+
+from psiutils.constants import Status
+
+import projects.history as history
+
+HISTORY = """# History
+
+Version 1.0.1 - 02 January 2025
+
+1. Fix
+------------------------------
+
+Version 1.0.0 - 01 January 2025
+
+1. First release
+------------------------------
+"""
+
+
+def test_insert_release_and_restore(tmp_path):
+    path = Path(tmp_path, 'HISTORY.md')
+    path.write_text(HISTORY)
+    block = history.release_block('1.0.2', datetime(2025, 1, 3))
+    assert block == (
+        'Version 1.0.2 - 03 January 2025\n\n1. \n' + '-' * 30 + '\n')
+
+    assert history.insert_release(path, block) == Status.OK
+    text = path.read_text()
+    assert text == HISTORY.replace(
+        '# History\n\n', f'# History\n\n{block}\n')
+    assert [release.version for release in history.releases(path)] == [
+        '1.0.2', '1.0.1', '1.0.0']
+
+    assert history.restore(path) == Status.OK
+    assert path.read_text() == HISTORY
+    assert history.restore(path) == Status.ERROR
+
+
+def test_releases_parsed_on_demand(tmp_path):
+    path = Path(tmp_path, 'HISTORY.md')
+    path.write_text(HISTORY)
+    release = next(history.releases(path))
+    assert release == history.Release(
+        '1.0.1', '02 January 2025', '1. Fix\n' + '-' * 30)
+    assert not list(history.releases(Path(tmp_path, 'missing.md')))
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+# The modules imported when the application starts
+STARTUP_MODULES = ('projects.main', 'projects.forms.frm_main')
+
+# Cumulative import time of STARTUP_MODULES, in microseconds. Re-record this
+# when a change to the startup path is intended.
+IMPORT_BUDGET_US = 750_000
+
+# Modules that must only be imported when their feature is first used
+DEFERRED_MODULES = (
+    'projects.build',
+    'projects.module_caller',
+    'projects.forms.frm_build',
+    'projects.forms.frm_compare',
+    'projects.forms.frm_config',
+    'projects.forms.frm_project_edit',
+    'projects.forms.frm_project_versions',
+    'projects.forms.frm_search',
+    'clipboard',
+    'dotenv',
+)
+
+
+def _import_times() -> dict[str, int]:
+    """Return the cumulative import time (us) of each module imported."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         f'import {", ".join(STARTUP_MODULES)}'],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        error = result.stderr.strip().split('\n')[-1]
+        if (error.startswith('ModuleNotFoundError')
+                and "'projects" not in error):
+            pytest.skip(f'Startup dependency not installed: {error}')
+        pytest.fail(error)
+
+    times = {}
+    for line in result.stderr.split('\n'):
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_startup_defers_forms_and_dependencies():
+    times = _import_times()
+    imported = [module for module in DEFERRED_MODULES if module in times]
+    assert not imported
+
+
+def test_startup_import_time_within_budget():
+    times = _import_times()
+    total = sum(times[module] for module in STARTUP_MODULES)
+    assert total <= IMPORT_BUDGET_US, (
+        f'Startup imports took {total} us, budget {IMPORT_BUDGET_US} us')
@@ -0,0 +1,47 @@
+import tracemalloc
+
+from projects.env_version import EnvironmentVersion
+from projects.project import Project
+
+PROJECTS = 1000
+ENVIRONMENTS = 20
+
+# Bytes allocated per project, with its environments, for the synthetic
+# workspace. Re-record this when the representation is meant to change.
+BYTES_PER_PROJECT_BUDGET = 5_000
+
+
+def _build_workspace() -> dict[str, Project]:
+    home = '/home/user'
+    projects = {}
+    for index in range(PROJECTS):
+        name = f'project_{index:04d}'
+        project = Project()
+        project.name = name
+        project.source_dir = f'{home}/projects/{name}/src/{name}'
+        project.cached_envs = {}
+        for env_index in range(ENVIRONMENTS):
+            env = f'3.12.{env_index}'
+            site_packages = (
+                f'{home}/.pyenv/versions/{env}/lib/python3.12/site-packages')
+            data = (env, f'{site_packages}/{name}', 'python3.12')
+            project.cached_envs[env] = EnvironmentVersion(data)
+        projects[name] = project
+    return projects
+
+
+def test_workspace_bytes_per_project():
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        projects = _build_workspace()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocated = sum(stat.size_diff
+                    for stat in after.compare_to(before, 'filename'))
+    bytes_per_project = allocated // len(projects)
+    assert bytes_per_project <= BYTES_PER_PROJECT_BUDGET, (
+        f'{bytes_per_project} bytes per project, '
+        f'budget {BYTES_PER_PROJECT_BUDGET}')
@@ -0,0 +1,69 @@
+import os
+from pathlib import Path
+
+import projects.modules as modules
+from projects.modules import check_imports
+
+
+def test_check_imports_finds_implicit_imports(tmp_path):
+    package_dir = Path(tmp_path, 'alpha')
+    Path(package_dir, 'forms').mkdir(parents=True)
+    Path(package_dir, 'constants.py').write_text('NAME = 1\n')
+    Path(package_dir, 'forms', 'frm_main.py').write_text(
+        'import os\n'
+        'from alpha.constants import NAME\n'
+        'from psiutils.constants import PAD\n'
+        '\n'
+        'def main():\n'
+        '    import constants\n'
+        '\n'
+        'from constants import (\n'
+        '    NAME,\n'
+        ')\n'
+        'from . import constants\n'
+    )
+
+    cache_path = Path(tmp_path, 'import_check.json')
+    findings = check_imports('alpha', package_dir, cache_path)
+
+    path = str(Path(package_dir, 'forms', 'frm_main.py'))
+    assert findings == [
+        (path, 6, 'import constants'),
+        (path, 8, 'from constants import ( NAME, )'),
+        (path, 11, 'from . import constants'),
+    ]
+    assert check_imports('alpha', package_dir, cache_path) == findings
+
+
+def test_unchanged_files_are_not_parsed_again(tmp_path, monkeypatch):
+    package_dir = Path(tmp_path, 'alpha')
+    package_dir.mkdir()
+    main_path = Path(package_dir, 'main.py')
+    main_path.write_text('import constants\n')
+    Path(package_dir, 'constants.py').write_text('NAME = 1\n')
+    cache_path = Path(tmp_path, 'import_check.json')
+    parsed = []
+    original = modules._check_imports
+
+    def counting_check(module_names, package, source):
+        parsed.append(source)
+        return original(module_names, package, source)
+
+    monkeypatch.setattr(modules, '_check_imports', counting_check)
+    findings = check_imports('alpha', package_dir, cache_path)
+    assert len(parsed) == 2
+
+    # Unchanged: the stat matches
+    assert check_imports('alpha', package_dir, cache_path) == findings
+    assert len(parsed) == 2
+
+    # Touched but not changed: the sha256 matches
+    stat = main_path.stat()
+    os.utime(main_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert check_imports('alpha', package_dir, cache_path) == findings
+    assert len(parsed) == 2
+
+    # A new module changes the findings of every file
+    Path(package_dir, 'extra.py').write_text('X = 1\n')
+    check_imports('alpha', package_dir, cache_path)
+    assert len(parsed) == 5
@@ -0,0 +1,213 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+from psiutils.constants import Status
+
+from projects.project_store import SqliteProjectStore
+
+import projects.project_server as project_server
+
+
+def test_project_server_is_shared(monkeypatch):
+    created = []
+
+    class CountingServer():
+        def __init__(self) -> None:
+            created.append(self)
+
+    monkeypatch.setattr(project_server, 'ProjectServer', CountingServer)
+    monkeypatch.setattr(project_server, '_project_server', None)
+    server = project_server.get_project_server()
+    assert project_server.get_project_server() is server
+    assert len(created) == 1
+
+
+def _make_server(tmp_path, monkeypatch) -> project_server.ProjectServer:
+    monkeypatch.setattr(project_server, 'DATA_DIR', str(tmp_path))
+    project_file = Path(tmp_path, project_server.config.project_file)
+    project_file.write_text(json.dumps({
+        'alpha': {
+            'dir': '/src/alpha',
+            'pypi': False,
+            'repository': '',
+            'build_for_windows': False,
+            'cached_envs': {'env': ['env', '/env/alpha', '3.12']},
+            'script': '',
+        },
+    }))
+    return project_server.ProjectServer()
+
+
+def test_save_skipped_when_unchanged(tmp_path, monkeypatch):
+    server = _make_server(tmp_path, monkeypatch)
+    writes = []
+    monkeypatch.setattr(
+        'projects.projects_io.update_json_file',
+        lambda *args: writes.append(args) or Status.OK)
+    assert server.changed_projects() == []
+    assert server.save_projects() == Status.OK
+    assert not writes
+
+    server.projects['alpha'].pypi = True
+    assert server.changed_projects() == ['alpha']
+    server.save_projects()
+    assert len(writes) == 1
+    server.save_projects()
+    assert len(writes) == 1
+
+
+class FakeRoot():
+    """Stands in for Tk; scheduled callbacks are run by the test."""
+
+    def __init__(self) -> None:
+        self.scheduled = {}
+
+    def after(self, delay, callback):
+        after_id = f'after#{len(self.scheduled)}'
+        self.scheduled[after_id] = callback
+        return after_id
+
+    def after_cancel(self, after_id):
+        del self.scheduled[after_id]
+
+
+def test_scheduled_saves_are_coalesced(tmp_path, monkeypatch):
+    server = _make_server(tmp_path, monkeypatch)
+    root = FakeRoot()
+    server.projects['alpha'].pypi = True
+    for _ in range(5):
+        server.schedule_save(root, delay=60)
+    assert len(root.scheduled) == 1
+    server.flush_save()
+    assert not root.scheduled
+    assert server.changed_projects() == []
+    assert not server._scheduled_save
+    saved = json.loads(server.project_file.read_text())
+    assert saved['alpha']['pypi'] is True
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_scheduled_save_runs_on_tk_thread(tmp_path, monkeypatch):
+    server = _make_server(tmp_path, monkeypatch)
+    root = FakeRoot()
+    server.projects['alpha'].pypi = True
+    server.schedule_save(root)
+    assert server.changed_projects() == ['alpha']
+
+    # Tk runs the callback once the delay has passed
+    callback, = root.scheduled.values()
+    callback()
+    assert server.changed_projects() == []
+    assert not server._scheduled_save
+
+
+def test_sqlite_store_migrates_and_writes_rows(tmp_path, monkeypatch):
+    json_server = _make_server(tmp_path, monkeypatch)
+    monkeypatch.setattr(project_server.config, 'project_file', 'projects.db')
+    server = project_server.ProjectServer()
+    assert isinstance(server.store, SqliteProjectStore)
+    assert server.store.read() == json.loads(
+        json_server.project_file.read_text())
+    assert server.changed_projects() == []
+
+    server.projects['alpha'].pypi = True
+    assert server.save_projects() == Status.OK
+    assert server.store.read()['alpha']['pypi'] is True
+    assert server.store.read()['alpha']['cached_envs'] == {
+        'env': ['env', '/env/alpha', '3.12']}
+
+    del server.projects['alpha']
+    server.projects['beta'] = project_server.Project()
+    server.projects['beta'].source_dir = '/src/beta'
+    server.save_projects()
+    assert list(project_server.ProjectServer().projects) == ['beta']
+
+
+def test_load_project_data_collects_errors(tmp_path, monkeypatch):
+    server = _make_server(tmp_path, monkeypatch)
+    for name in ('beta', 'gamma'):
+        server.projects[name] = project_server.Project()
+        server.projects[name].name = name
+    pools = []
+
+    class RecordingPool(project_server.ThreadPoolExecutor):
+        def __init__(self, max_workers):
+            pools.append(max_workers)
+            super().__init__(max_workers=max_workers)
+
+    def load_data(project):
+        if project.name == 'beta':
+            raise OSError('unreadable')
+
+    monkeypatch.setattr(project_server, 'ThreadPoolExecutor', RecordingPool)
+    monkeypatch.setattr(project_server.Project, 'load_data', load_data)
+    errors = server.load_project_data(workers=3)
+    assert list(errors) == ['beta']
+    assert isinstance(errors['beta'], OSError)
+
+    monkeypatch.setattr(project_server.config, 'load_workers', 5)
+    server.load_project_data()
+    assert pools == [3, 5]
+
+
+def test_versions_not_read_half_loaded(tmp_path, monkeypatch):
+    source = Path(tmp_path, 'src', 'alpha')
+    source.mkdir(parents=True)
+    Path(source, '_version.py').write_text("__version__ = '1.2.3'\n")
+    Path(tmp_path, 'src', 'pyproject.toml').write_text('version = "1.2.3"\n')
+    project = project_server.Project()
+    project.source_dir = str(source)
+
+    reading = threading.Event()
+    get_project_version = project_server.Project._get_project_version
+
+    def slow_get_project_version(self):
+        reading.set()
+        time.sleep(0.2)
+        return get_project_version(self)
+
+    monkeypatch.setattr(
+        project_server.Project, '_get_project_version',
+        slow_get_project_version)
+    loader = threading.Thread(target=project.load_data)
+    loader.start()
+    reading.wait(5)
+    assert project.project_version == '1.2.3'
+    loader.join()
+
+
+def test_cancel_after_window_destroyed(tmp_path, monkeypatch):
+    server = _make_server(tmp_path, monkeypatch)
+
+    class DestroyedRoot(FakeRoot):
+        def after_cancel(self, after_id):
+            raise RuntimeError('application has been destroyed')
+
+    server.projects['alpha'].pypi = True
+    server.schedule_save(DestroyedRoot())
+    server.flush_save()
+    assert server.changed_projects() == []
+
+
+def test_construction_reads_no_project_files(tmp_path, monkeypatch):
+    def no_read(path):
+        raise AssertionError(f'{path} read')
+
+    monkeypatch.setattr('projects.projects_io.read_text_file', no_read)
+    server = _make_server(tmp_path, monkeypatch)
+    monkeypatch.setattr(project_server, '_project_server', server)
+    project = project_server.get_project_server().projects['alpha']
+
+    reads = []
+
+    def read_text_file(path):
+        reads.append(Path(path).name)
+        return "__version__ = '1.2.3'\nversion = '1.2.3'\n"
+
+    monkeypatch.setattr('projects.projects_io.read_text_file', read_text_file)
+    assert project.project_version == '1.2.3'
+    assert reads == ['_version.py', 'pyproject.toml']
+    assert project.pyproject_version == '1.2.3'
+    assert len(reads) == 2
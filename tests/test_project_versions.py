@@ -0,0 +1,140 @@
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from projects.env_version import EnvironmentVersion
+from projects.project import Project
+from projects.tasks import TaskRunner
+
+try:
+    import projects.forms.frm_project_versions as frm_project_versions
+except ImportError as import_error:
+    # The forms need the psiutils release pinned in pyproject.toml
+    pytest.skip(f'Forms not importable: {import_error}',
+                allow_module_level=True)
+
+COMPARING = frm_project_versions.COMPARING
+ProjectVersionsFrame = frm_project_versions.ProjectVersionsFrame
+
+
+class FakeRoot():
+    """Stands in for Tk; _poll is called by the test."""
+
+    def after(self, delay, callback):
+        return 'after'
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class FakeWidget():
+    """Stands in for a ttk widget, recording its configure calls."""
+
+    def __init__(self, master, text='', **kwargs) -> None:
+        self.text = text
+        self.style = ''
+        self.updates = 0
+        master.children.append(self)
+
+    def grid(self, **kwargs) -> None:
+        pass
+
+    def configure(self, text='', style='') -> None:
+        self.text = text
+        self.style = style
+        self.updates += 1
+
+    def destroy(self) -> None:
+        pass
+
+
+class FakeFrame():
+    def __init__(self) -> None:
+        self.children = []
+
+    def winfo_children(self) -> list:
+        children, self.children = self.children, []
+        return children
+
+
+@pytest.fixture
+def frame(tmp_path, monkeypatch) -> ProjectVersionsFrame:
+    monkeypatch.setattr(frm_project_versions, 'ttk', SimpleNamespace(
+        Radiobutton=FakeWidget, Label=FakeWidget))
+    project = Project()
+    project.name = 'alpha'
+    project.source_dir = str(tmp_path)
+    project.cached_envs = {
+        name: EnvironmentVersion([name, str(Path(tmp_path, name)), '3.12'])
+        for name in ('env_a', 'env_b')
+    }
+
+    frame = ProjectVersionsFrame.__new__(ProjectVersionsFrame)
+    frame.project = project
+    frame.refresh = False
+    frame.version = None
+    frame.canvas_frame = FakeFrame()
+    frame.tasks = TaskRunner(FakeRoot(), workers=4)
+    frame.compare_tasks = []
+    frame.version_buttons = {}
+    yield frame
+    frame.tasks.shutdown()
+
+
+@pytest.fixture
+def releases(monkeypatch) -> dict[str, threading.Event]:
+    """Hold each environment's compare until its event is set."""
+    events = {'env_a': threading.Event(), 'env_b': threading.Event()}
+
+    def held_compare(source_dir, env_dir):
+        events[Path(env_dir).name].wait(5)
+        return ([], ['main.py'], [])
+
+    monkeypatch.setattr(frm_project_versions, '_shallow_compare', held_compare)
+    return events
+
+
+def _wait(tasks) -> None:
+    for task in tasks:
+        try:
+            task.future.result(timeout=5)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+
+def test_rows_shown_at_once_and_updated_per_result(frame, releases):
+    frame._populate_versions_frame()
+    buttons = frame.version_buttons
+    assert sorted(buttons) == ['env_a', 'env_b']
+    assert all(button.text.endswith(COMPARING) for button in buttons.values())
+
+    releases['env_a'].set()
+    _wait(frame.compare_tasks[:1])
+    frame.tasks._poll()
+    assert buttons['env_a'].updates == 1
+    assert 'main.py' in buttons['env_a'].text
+    assert buttons['env_b'].updates == 0
+    assert buttons['env_b'].text.endswith(COMPARING)
+
+    releases['env_b'].set()
+    _wait(frame.compare_tasks)
+    frame.tasks._poll()
+    assert [button.updates for button in buttons.values()] == [1, 1]
+
+
+def test_earlier_population_results_dropped(frame, releases):
+    frame._populate_versions_frame()
+    old_buttons = dict(frame.version_buttons)
+    old_tasks = list(frame.compare_tasks)
+
+    frame._populate_versions_frame()
+    for event in releases.values():
+        event.set()
+    _wait(old_tasks + frame.compare_tasks)
+    frame.tasks._poll()
+
+    assert all(button.updates == 0 for button in old_buttons.values())
+    assert all(
+        button.updates == 1 for button in frame.version_buttons.values())
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from projects.project import Project
+from projects.project_store import SqliteProjectStore
+from projects.snapshot import ProjectSnapshot
+
+
+def _make_project(tmp_path: Path, snapshot: ProjectSnapshot) -> Project:
+    source_dir = Path(tmp_path, 'src', 'alpha')
+    source_dir.mkdir(parents=True)
+    Path(source_dir, '_version.py').write_text("__version__ = '1.2.3'")
+    Path(tmp_path, 'pyproject.toml').write_text('version = "1.2.3"\n')
+
+    project = Project()
+    project.name = 'alpha'
+    project.source_dir = str(source_dir)
+    project.snapshot = snapshot
+    return project
+
+
+def test_snapshot_restores_versions_without_reading(tmp_path, monkeypatch):
+    snapshot_path = Path(tmp_path, 'snapshot.json')
+    snapshot = ProjectSnapshot(snapshot_path)
+    project = _make_project(tmp_path, snapshot)
+    assert project.project_version == '1.2.3'
+    snapshot.save()
+
+    project = Project()
+    project.name = 'alpha'
+    project.source_dir = str(Path(tmp_path, 'src', 'alpha'))
+    project.snapshot = ProjectSnapshot(snapshot_path)
+
+    def no_read(*args):
+        raise AssertionError('file read')
+    monkeypatch.setattr('projects.projects_io.read_text_file', no_read)
+    assert project.project_version == '1.2.3'
+    assert project.pyproject_version == '1.2.3'
+    assert not project.py_project_missing
+
+
+def test_snapshot_invalidated_by_stat(tmp_path):
+    snapshot = ProjectSnapshot()
+    project = _make_project(tmp_path, snapshot)
+    assert project.project_version == '1.2.3'
+
+    project.update_version('1.2.40')
+    project.invalidate_data()
+    assert project.project_version == '1.2.40'
+
+
+def test_snapshot_kept_in_sqlite_store(tmp_path):
+    store = SqliteProjectStore(Path(tmp_path, 'projects.db'))
+    snapshot = ProjectSnapshot(store=store)
+    snapshot.put('alpha', [[1, 2]], {'project_version': '1.2.3'})
+    snapshot.put('beta', [None], {'project_version': ''})
+    snapshot.save()
+    snapshot.discard('beta')
+    snapshot.save()
+
+    snapshot = ProjectSnapshot(store=store)
+    assert list(snapshot.entries) == ['alpha']
+    assert snapshot.get('alpha', [[1, 2]]) == {'project_version': '1.2.3'}
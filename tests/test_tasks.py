@@ -0,0 +1,80 @@
+import threading
+
+from projects.tasks import TaskRunner
+
+
+class FakeRoot():
+    """Stands in for Tk; _poll is called by the test."""
+
+    def __init__(self) -> None:
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        pass
+
+
+def _wait(task) -> None:
+    try:
+        task.future.result(timeout=5)
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+def test_done_and_error_delivered_on_poll():
+    runner = TaskRunner(FakeRoot())
+    results, errors = [], []
+    done = runner.submit(sum, [1, 2, 3], on_done=results.append)
+    failed = runner.submit(
+        int, 'x', on_done=results.append, on_error=errors.append)
+    _wait(done)
+    _wait(failed)
+    assert not results
+    runner._poll()
+    assert results == [6]
+    assert isinstance(errors[0], ValueError)
+    assert not runner.tasks
+    runner.shutdown()
+
+
+def test_progress_and_cancel():
+    runner = TaskRunner(FakeRoot())
+    started = threading.Event()
+    release = threading.Event()
+    progress, results = [], []
+
+    def job(task):
+        task.report('step 1')
+        started.set()
+        release.wait(5)
+        task.report('step 2')
+        return 'finished'
+
+    task = runner.submit(
+        job, on_done=results.append, on_progress=progress.append,
+        pass_task=True)
+    started.wait(5)
+    runner._poll()
+    assert progress == ['step 1']
+
+    task.cancel()
+    release.set()
+    _wait(task)
+    runner._poll()
+    assert progress == ['step 1']
+    assert not results
+    assert not runner.tasks
+    runner.shutdown()
+
+
+def test_no_callbacks_after_shutdown():
+    runner = TaskRunner(FakeRoot())
+    results = []
+    task = runner.submit(len, 'abc', on_done=results.append)
+    _wait(task)
+    runner.shutdown()
+    runner._poll()
+    assert not results
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from projects.env_version import EnvironmentVersion
+from projects.version_resolver import (
+    resolve_version, NO_VERSION_FILE, VERSION_ERROR)
+
+
+def test_version_from_dist_info_name(tmp_path):
+    Path(tmp_path, 'psi_utils').mkdir()
+    Path(tmp_path, 'psi_utils-2.0.3.dist-info').mkdir()
+    Path(tmp_path, 'psi_utils_extra-9.9.9.dist-info').mkdir()
+    assert resolve_version(str(Path(tmp_path, 'psi_utils'))) == '2.0.3'
+
+
+def test_version_from_version_file(tmp_path):
+    package_dir = Path(tmp_path, 'alpha')
+    package_dir.mkdir()
+    Path(package_dir, '_version.py').write_text(
+        "# 0.0.0\n__version__ = '1.2.3rc1'\n")
+    assert resolve_version(str(package_dir)) == '1.2.3rc1'
+
+
+def test_version_missing(tmp_path):
+    package_dir = Path(tmp_path, 'alpha')
+    package_dir.mkdir()
+    assert resolve_version(str(package_dir)) == NO_VERSION_FILE
+
+    Path(package_dir, '_version.py').write_text('VERSION = 1\n')
+    assert resolve_version(str(package_dir)) == VERSION_ERROR
+
+
+def test_environment_version_is_lazy_and_invalidated(tmp_path):
+    package_dir = Path(tmp_path, 'alpha')
+    package_dir.mkdir()
+    version_path = Path(package_dir, '_version.py')
+    version_path.write_text("__version__ = '1.0.0'\n")
+
+    env = EnvironmentVersion(('env', str(package_dir), 'python3.12'))
+    assert env._version is None
+    assert env.version == '1.0.0'
+
+    version_path.write_text("__version__ = '1.0.10'\n")
+    assert env.version == '1.0.10'
+
+
+def test_venv_python_from_dir():
+    env = EnvironmentVersion(
+        ('env', '/home/u/alpha/.venv/lib/python3.12/site-packages/alpha',
+         'python3.12'))
+    assert env.venv_python == '/home/u/alpha/.venv/bin/python'